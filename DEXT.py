@@ -1,27 +1,1786 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import argparse
 import csv
+import heapq
+import hmac
+import http.client
+import io
+import ipaddress
+import itertools
+import json
+import mmap
+import os
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler
+import gc
+import glob
 import platform
+import secrets
+import socket
+import socketserver
+import struct
+import threading
+import time
+import zipfile
 import tkinter.font as tkfont
 try:
     # For a modern look and feel. Install with: pip install ttkthemes
     from ttkthemes import ThemedTk
 except ImportError:
     ThemedTk = tk.Tk  # Fallback to standard Tk if ttkthemes is not installed
+try:
+    # For vectorized decoding of response logs. Install with: pip install numpy
+    import numpy as np
+except ImportError:
+    np = None  # Fallback to struct.iter_unpack if numpy is not installed
+try:
+    # For the autosave session locks: fcntl on POSIX, msvcrt on Windows
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 # --- Configuration ---
 ARXML_OUTPUT_FILE = 'dext_output.arxml'
-AUTOSAR_NAMESPACE = "http://autosar.org/schema/r4.0"
 XSI_NAMESPACE = "https://www.w3.org/2001/XMLSchema-instance"
 SCHEMA_LOCATION = "http://autosar.org/schema/r4.0 AUTOSAR_00052.xsd"
+# Emit one DIAGNOSTIC-ACCESS-PERMISSION per (service, session, security) instead of one per DID
+GROUP_ACCESS_PERMISSIONS = False
+READ_SERVICE_REF = "/AUTOSAR_Dcm/DiagnosticServices/ReadDataByIdentifier"
+WRITE_SERVICE_REF = "/AUTOSAR_Dcm/DiagnosticServices/WriteDataByIdentifier"
+# Files smaller than this are parsed in-process; the pool start-up cost outweighs the gain.
+PARALLEL_CSV_MIN_BYTES = 4 * 1024 * 1024
+# Upper bound on cached per-DID XML fragments before the cache is reset
+FRAGMENT_CACHE_LIMIT = 500000
+DEXT_SERVER_PORT = 8765  # Loopback TCP fallback where Unix sockets are unavailable
+DEXT_RUNTIME_DIR = os.path.join(os.path.expanduser("~"), ".dext")  # Owner-only (0700)
+DEXT_SERVER_SOCKET = os.path.join(DEXT_RUNTIME_DIR, "server.sock")
+DEXT_SERVER_TOKEN_FILE = os.path.join(DEXT_RUNTIME_DIR, "server.token")
+DEXT_TOKEN_HEADER = "X-Dext-Token"
+# Crash recovery: snapshot + append-only journal of edits, next to the generated output
+AUTOSAVE_SUFFIX = '.dext-autosave'  # Hidden .<project>.<session>.dext-autosave.{snapshot,journal}
+AUTOSAVE_COMPACT_EVERY = 500  # Journal records before they are folded into a new snapshot
+# UDS positive response SID for ReadDataByIdentifier (0x22 + 0x40)
+UDS_READ_DATA_BY_IDENTIFIER_RESPONSE = 0x62
+UDS_NEGATIVE_RESPONSE = 0x7F  # 7F <SID> <NRC>
+HEX_LOG_EXTENSIONS = ('.hex', '.txt')  # Response logs stored as hex text rather than raw bytes
+# Big-endian wire formats per signal type (strings are sized per signal)
+STRUCT_FORMATS = {
+    'uint8': 'B', 'sint8': 'b', 'boolean': '?',
+    'uint16': 'H', 'sint16': 'h',
+    'uint32': 'I', 'sint32': 'i', 'float32': 'f',
+    'uint64': 'Q', 'sint64': 'q', 'float64': 'd',
+}
+NUMPY_FORMATS = {
+    'uint8': 'u1', 'sint8': 'i1', 'boolean': '?',
+    'uint16': '>u2', 'sint16': '>i2',
+    'uint32': '>u4', 'sint32': '>i4', 'float32': '>f4',
+    'uint64': '>u8', 'sint64': '>i8', 'float64': '>f8',
+}
+# Optional column in variant overlay CSVs: 'set' (default), 'permissions' or 'remove'
+OVERLAY_ACTION_COLUMN = 'Overlay_Action'
+PERMISSION_FIELDS = ('read_enabled', 'session', 'security',
+                     'write_enabled', 'write_session', 'write_security')
+# Field groups compared and resolved independently when merging DID sources
+MERGE_FIELD_GROUPS = {
+    'signals': ('signals',),
+    'access': PERMISSION_FIELDS,
+}
+# UDS service IDs used to recognise DID services in ODX databases
+UDS_READ_DATA_BY_IDENTIFIER = 0x22
+UDS_WRITE_DATA_BY_IDENTIFIER = 0x2E
+# Service short-name decorations stripped to derive the DID name
+ODX_SERVICE_PREFIXES = ('ReadDataByIdentifier_', 'WriteDataByIdentifier_',
+                        'RDBI_', 'WDBI_', 'Read_', 'Write_')
+ODX_SERVICE_SUFFIXES = ('_Read', '_Write')
+# ODX elements reduced to index tuples; their subtrees are kept until they end
+ODX_DEFINITION_TAGS = frozenset(('DATA-OBJECT-PROP', 'STRUCTURE', 'REQUEST',
+                                 'POS-RESPONSE', 'NEG-RESPONSE', 'DIAG-SERVICE'))
+# Reference targets defined outside the generated extract (platform types, Dcm service classes)
+EXTERNAL_REFERENCE_PATHS = frozenset(
+    [f"/AUTOSAR_Platform/ImplementationDataTypes/{t}"
+     for t in ('uint8', 'uint16', 'uint32', 'uint64', 'sint8', 'sint16',
+               'sint32', 'sint64', 'boolean', 'float32', 'float64')]
+    + [READ_SERVICE_REF, WRITE_SERVICE_REF])
+
+
+# --- CSV Loading ---
+def _parse_did_rows(rows):
+    """Groups CSV rows into the DID data structure, keeping DIDs in first-seen order."""
+    dids_data = defaultdict(lambda: {"signals": []})
+    for row in rows:
+        did_name = row.get('DID_Name')
+        if not did_name: continue
+
+        did_info = dids_data[did_name]
+
+        # Populate DID-level info only once from the first row for that DID
+        if 'id' not in did_info:
+            did_info['id'] = row.get('DID_ID')
+            # For backward compatibility, default Read_Enabled to True if not in CSV
+            did_info['read_enabled'] = row.get('Read_Enabled', 'True').lower() in ('true', '1', 'yes')
+            did_info['session'] = row.get('Session', 'Default Session')
+            did_info['security'] = row.get('SecurityLevel', 'No Security')
+            did_info['write_enabled'] = row.get('Write_Enabled', 'False').lower() in ('true', '1', 'yes')
+            did_info['write_session'] = row.get('Write_Session', 'Extended Session')
+            did_info['write_security'] = row.get('Write_Security', 'Level 1')
+
+        # Append signal info for every row that has a signal
+        if row.get('SignalName'):
+            did_info['signals'].append({
+                "name": row['SignalName'],
+                "type": row.get('DataType', 'uint8'),
+                "size": row.get('Size', '1')
+            })
+    return dict(dids_data)
+
+
+def read_dids_csv(filepath):
+    """Reads a DID CSV file sequentially and returns the DID data dictionary."""
+    with open(filepath, mode='r', encoding='utf-8') as f:
+        return _parse_did_rows(csv.DictReader(f))
+
+
+def _parse_csv_shard(filepath, fieldnames, start, end):
+    """Worker: parses the bytes [start, end) of a CSV file, which must begin and end on line boundaries.
+
+    Returns (dids_data, odd_quotes). An odd number of quote characters means
+    a quoted field spans the shard boundary, so the shard was cut mid-record.
+    """
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+    if data.count(b'"') % 2:
+        return None, True  # Mis-cut rows may not even parse; the caller falls back
+    # Decode exactly like open(..., encoding='utf-8') does, including newline translation
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    return _parse_did_rows(csv.DictReader(text, fieldnames=fieldnames)), False
+
+
+def _merge_did_shards(shard_results):
+    """Merges per-shard results in file order. The first shard that saw a DID
+    keeps its DID-level fields; signals from later shards are appended."""
+    merged = {}
+    for shard in shard_results:
+        for did_name, did_info in shard.items():
+            existing = merged.get(did_name)
+            if existing is None:
+                merged[did_name] = did_info
+            else:
+                existing['signals'].extend(did_info['signals'])
+    return merged
+
+
+def read_dids_csv_parallel(filepath, workers=None):
+    """Reads a DID CSV file by splitting it into line-aligned shards that are
+    parsed in a process pool. The result is identical to read_dids_csv.
+
+    Shards are cut at newline bytes. If a quoted field containing a line
+    break straddles a cut, the shard results are discarded and the file is
+    read sequentially instead.
+    """
+    workers = workers or os.cpu_count() or 1
+    file_size = os.path.getsize(filepath)
+    if workers < 2 or file_size < PARALLEL_CSV_MIN_BYTES:
+        return read_dids_csv(filepath)
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b'\n') + 1
+        if header_end == 0:
+            return read_dids_csv(filepath)
+        if mm[:header_end].count(b'"') % 2:
+            return read_dids_csv(filepath)  # Line break inside a quoted header field
+        header = io.TextIOWrapper(io.BytesIO(mm[:header_end]), encoding='utf-8')
+        fieldnames = next(csv.reader(header))
+
+        # Cut the body into roughly equal shards, moving each cut to the next line start
+        boundaries = [header_end]
+        shard_size = max(1, (file_size - header_end) // (workers * 4))
+        while boundaries[-1] < file_size:
+            cut = mm.find(b'\n', boundaries[-1] + shard_size)
+            boundaries.append(file_size if cut == -1 else cut + 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shard_results = pool.map(_parse_csv_shard,
+                                 [filepath] * (len(boundaries) - 1),
+                                 [fieldnames] * (len(boundaries) - 1),
+                                 boundaries[:-1], boundaries[1:])
+        shards = []
+        # Checked in file order: shards after the first mis-cut one start inside
+        # a quoted field and may not even parse, so they are never looked at.
+        for dids, odd_quotes in shard_results:
+            if odd_quotes:
+                break
+            shards.append(dids)
+        else:
+            return _merge_did_shards(shards)
+    return read_dids_csv(filepath)
+
+
+# --- Variant Overlays ---
+def read_overlay_csv(filepath):
+    """Reads a variant overlay: a DID CSV with an optional Overlay_Action column.
+
+    Returns {did_name: (action, did_info)} where action is 'set' (add or
+    replace the whole DID), 'permissions' (only replace the access rights of
+    a base DID, keeping its signals) or 'remove'.
+    """
+    with open(filepath, mode='r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    actions = {}
+    for row in rows:
+        did_name = row.get('DID_Name')
+        if did_name and did_name not in actions:
+            actions[did_name] = (row.get(OVERLAY_ACTION_COLUMN) or 'set').strip().lower()
+
+    overlay = {}
+    for did_name, did_info in _parse_did_rows(rows).items():
+        action = actions[did_name]
+        if action not in ('set', 'permissions', 'remove'):
+            raise ValueError(f"Unknown overlay action '{action}' for DID '{did_name}'")
+        overlay[did_name] = (action, did_info)
+    return overlay
+
+
+def read_overlays(filepaths):
+    """Reads overlay CSVs into {variant_name: overlay}, named after each file.
+
+    Variant names become output file names, so two overlays whose names differ
+    only by directory or letter case are rejected rather than overwriting
+    one another.
+    """
+    overlays = {}
+    paths_by_name = {}
+    for filepath in filepaths:
+        variant_name = os.path.splitext(os.path.basename(filepath))[0]
+        key = variant_name.lower()
+        if key in paths_by_name:
+            raise ValueError(f"Overlays '{paths_by_name[key]}' and '{filepath}' would both be "
+                             f"written as variant '{variant_name}'; rename one of them")
+        paths_by_name[key] = filepath
+        overlays[variant_name] = read_overlay_csv(filepath)
+    return overlays
+
+
+def apply_overlay(base, overlay):
+    """Returns the variant DID dictionary for an overlay without copying
+    unchanged DIDs, so they stay identical (``is``) to the base entries."""
+    variant = dict(base)
+    for did_name, (action, did_info) in overlay.items():
+        if action == 'remove':
+            variant.pop(did_name, None)
+        elif action == 'permissions':
+            if did_name not in base:
+                raise ValueError(f"Overlay changes permissions of unknown DID '{did_name}'")
+            updated = dict(base[did_name])
+            updated.update((field, did_info[field]) for field in PERMISSION_FIELDS)
+            variant[did_name] = updated
+        else:
+            variant[did_name] = did_info
+    return variant
+
+
+# --- ODX/PDX Import ---
+def _local_name(tag):
+    return tag.rpartition('}')[2]
+
+
+def _odx_child(elem, name):
+    for child in elem:
+        if _local_name(child.tag) == name:
+            return child
+    return None
+
+
+def _odx_child_text(elem, name):
+    child = _odx_child(elem, name) if elem is not None else None
+    return child.text.strip() if child is not None and child.text else None
+
+
+def _odx_id_ref(elem, name):
+    child = _odx_child(elem, name)
+    return child.get('ID-REF') if child is not None else None
+
+
+def _odx_xsi_type(elem):
+    for key, value in elem.attrib.items():
+        if _local_name(key) == 'type':
+            return value
+    return None
+
+
+def _odx_params(elem):
+    """Reduces a PARAMS block to (xsi_type, semantic, short_name, coded_value, dop_ref) tuples."""
+    params = []
+    params_elem = _odx_child(elem, 'PARAMS')
+    if params_elem is None:
+        return params
+    for param in params_elem:
+        if _local_name(param.tag) != 'PARAM':
+            continue
+        coded_value = _odx_child_text(param, 'CODED-VALUE')
+        try:
+            # ODX coded values are decimal; string CODED-CONSTs are not numeric
+            coded_value = int(coded_value)
+        except (TypeError, ValueError):
+            coded_value = None
+        params.append((_odx_xsi_type(param),
+                       param.get('SEMANTIC'),
+                       _odx_child_text(param, 'SHORT-NAME'),
+                       coded_value,
+                       _odx_id_ref(param, 'DOP-REF')))
+    return params
+
+
+def _odx_coded_type(base_data_type, bit_length, max_length):
+    """Maps an ODX DIAG-CODED-TYPE onto one of DIDEditorWindow.AUTOSAR_TYPES and a size."""
+    base_data_type = (base_data_type or 'A_UINT32').upper()
+    if base_data_type in ('A_FLOAT32', 'A_FLOAT64'):
+        data_type = base_data_type[2:].lower()
+    elif base_data_type in ('A_UINT32', 'A_INT32'):
+        bits = bit_length or 32
+        if base_data_type == 'A_UINT32' and bits == 1:
+            data_type = 'boolean'
+        else:
+            prefix = 'uint' if base_data_type == 'A_UINT32' else 'sint'
+            width = next((w for w in (8, 16, 32, 64) if bits <= w), 64)
+            data_type = f"{prefix}{width}"
+    else:
+        # A_ASCIISTRING, A_UTF8STRING, A_UNICODE2STRING and A_BYTEFIELD are byte arrays
+        size = (bit_length + 7) // 8 if bit_length else (max_length or 1)
+        return 'string', str(size)
+
+    if data_type not in DIDEditorWindow.AUTOSAR_TYPES:
+        raise ValueError(f"Unsupported ODX coded type '{base_data_type}'")
+    return data_type, str(DextGeneratorApp.TYPE_SIZE_MAP[data_type])
+
+
+def _new_odx_index():
+    return {"dops": {}, "structures": {}, "requests": {}, "responses": {},
+            "services": []}
+
+
+def _index_odx_stream(source, index):
+    """Streams one ODX document into the ID-keyed index.
+
+    Every element is cleared and detached from its parent as soon as it ends,
+    unless it lies inside a definition that has not been reduced to a tuple
+    yet, so memory is bounded by the largest single definition rather than by
+    the document (SDGs, COMPU-METHODs, ADMIN-DATA etc. are dropped as they go).
+    """
+    stack = []
+    open_definitions = 0
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        tag = _local_name(elem.tag)
+        if event == 'start':
+            stack.append(elem)
+            if tag in ODX_DEFINITION_TAGS:
+                open_definitions += 1
+            continue
+        stack.pop()
+
+        if tag in ODX_DEFINITION_TAGS:
+            open_definitions -= 1
+            if tag == 'DATA-OBJECT-PROP':
+                coded = _odx_child(elem, 'DIAG-CODED-TYPE')
+                bit_length = _odx_child_text(coded, 'BIT-LENGTH')
+                max_length = _odx_child_text(coded, 'MAX-LENGTH')
+                index["dops"][elem.get('ID')] = _odx_coded_type(
+                    coded.get('BASE-DATA-TYPE') if coded is not None else None,
+                    int(bit_length) if bit_length else None,
+                    int(max_length) if max_length else None)
+            elif tag == 'STRUCTURE':
+                index["structures"][elem.get('ID')] = _odx_params(elem)
+            elif tag == 'REQUEST':
+                index["requests"][elem.get('ID')] = _odx_params(elem)
+            elif tag == 'POS-RESPONSE':
+                index["responses"][elem.get('ID')] = _odx_params(elem)
+            elif tag == 'DIAG-SERVICE':
+                response_refs = _odx_child(elem, 'POS-RESPONSE-REFS')
+                index["services"].append((
+                    _odx_child_text(elem, 'SHORT-NAME'),
+                    _odx_id_ref(elem, 'REQUEST-REF'),
+                    [ref.get('ID-REF') for ref in response_refs] if response_refs is not None else []))
+
+        if open_definitions:
+            continue  # Still part of a definition that is being read
+
+        # Free the processed subtree and drop it from its parent. The parser may
+        # already have appended later siblings, so remove by identity.
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def _odx_signals(params, index, seen=None):
+    """Flattens VALUE params (expanding STRUCTURE references) into signal dicts."""
+    seen = seen or set()
+    signals = []
+    for xsi_type, _semantic, short_name, _coded_value, dop_ref in params:
+        if xsi_type != 'VALUE' or not dop_ref:
+            continue
+        if dop_ref in index["dops"]:
+            data_type, size = index["dops"][dop_ref]
+            signals.append({"name": short_name, "type": data_type, "size": size})
+        elif dop_ref in index["structures"] and dop_ref not in seen:
+            signals.extend(_odx_signals(index["structures"][dop_ref], index,
+                                        seen | {dop_ref}))
+    return signals
+
+
+def _odx_did_name(service_name):
+    for prefix in ODX_SERVICE_PREFIXES:
+        if service_name.startswith(prefix):
+            service_name = service_name[len(prefix):]
+            break
+    for suffix in ODX_SERVICE_SUFFIXES:
+        if service_name.endswith(suffix):
+            service_name = service_name[:-len(suffix)]
+            break
+    return service_name
+
+
+def _resolve_odx_index(index):
+    """Builds the DID data dictionary from the ReadDataByIdentifier and
+    WriteDataByIdentifier services in the index."""
+    dids_by_id = {}
+    for service_name, request_ref, response_refs in index["services"]:
+        request = index["requests"].get(request_ref)
+        if not request:
+            continue
+        coded_consts = [p for p in request if p[0] == 'CODED-CONST' and p[3] is not None]
+        sid = next((p[3] for p in coded_consts if p[1] == 'SERVICE-ID'),
+                   coded_consts[0][3] if coded_consts else None)
+        if sid not in (UDS_READ_DATA_BY_IDENTIFIER, UDS_WRITE_DATA_BY_IDENTIFIER):
+            continue
+        did_value = next((p[3] for p in coded_consts if p[1] == 'ID'),
+                         coded_consts[1][3] if len(coded_consts) > 1 else None)
+        if did_value is None:
+            continue
+
+        did_info = dids_by_id.setdefault(did_value, {
+            "name": _odx_did_name(service_name or format(did_value, 'X')),
+            "id": format(did_value, 'X'),
+            "read_enabled": False,
+            "session": "Default Session",
+            "security": "No Security",
+            "write_enabled": False,
+            "write_session": "Extended Session",
+            "write_security": "Level 1",
+            "signals": []
+        })
+        if sid == UDS_READ_DATA_BY_IDENTIFIER:
+            did_info["read_enabled"] = True
+            # The read response is the authoritative signal layout
+            signals = []
+            for response_ref in response_refs:
+                signals.extend(_odx_signals(index["responses"].get(response_ref, []), index))
+            if signals:
+                did_info["signals"] = signals
+        else:
+            did_info["write_enabled"] = True
+            if not did_info["signals"]:
+                did_info["signals"] = _odx_signals(request, index)
+
+    dids_data = {}
+    for did_info in dids_by_id.values():
+        did_name = did_info.pop("name")
+        if did_name in dids_data:
+            did_name = f"{did_name}_{did_info['id']}"
+        dids_data[did_name] = did_info
+    return dids_data
+
+
+def read_dids_odx(filepath):
+    """Imports DID definitions from an ODX file or from every ODX document in a PDX archive.
+
+    ID-REFs are resolved across all documents of a PDX. Sessions and security
+    levels are not derived from ODX state charts; the editor defaults are used.
+    """
+    index = _new_odx_index()
+    if zipfile.is_zipfile(filepath):
+        with zipfile.ZipFile(filepath) as pdx:
+            for member in pdx.namelist():
+                if os.path.splitext(member)[1].lower().startswith('.odx'):
+                    with pdx.open(member) as f:
+                        _index_odx_stream(f, index)
+    else:
+        with open(filepath, 'rb') as f:
+            _index_odx_stream(f, index)
+    return _resolve_odx_index(index)
+
+
+# --- Multi-Source Merge ---
+class UnsortedSourceError(ValueError):
+    """Raised when a source passed as pre-sorted is not ordered by numeric DID ID."""
+
+
+def _did_sort_key(did_name, did_info):
+    return int(did_info['id'], 16), did_name
+
+
+def _iter_csv_dids(filepath):
+    """Streams (did_name, did_info) from a CSV whose rows are grouped by DID."""
+    with open(filepath, mode='r', encoding='utf-8') as f:
+        reader = (row for row in csv.DictReader(f) if row.get('DID_Name'))
+        for _, rows in itertools.groupby(reader, key=lambda row: row['DID_Name']):
+            yield from _parse_did_rows(rows).items()
+
+
+def _iter_arxml_dids(filepath):
+    """Yields (did_name, did_info) sorted by DID ID from a DEXT ARXML file.
+
+    Signals and access rights live in other packages than the DIDs, so the
+    file is indexed in one iterparse pass before anything is yielded.
+    """
+    dids, prototypes, data_types = {}, {}, {}
+    permissions = []
+    for _, elem in ET.iterparse(filepath):
+        tag = _local_name(elem.tag)
+        if tag == 'DIAGNOSTIC-DATA-IDENTIFIER':
+            refs = _odx_child(elem, 'DATA-ELEMENT-REFS')
+            dids[_odx_child_text(elem, 'SHORT-NAME')] = (
+                int(_odx_child_text(elem, 'ID')),
+                [ref.text.rpartition('/')[2] for ref in refs] if refs is not None else [])
+        elif tag == 'DATA-ELEMENT-PROTOTYPE':
+            prototypes[_odx_child_text(elem, 'SHORT-NAME')] = \
+                _odx_child_text(elem, 'TYPE-TREF').rpartition('/')[2]
+        elif tag == 'IMPLEMENTATION-DATA-TYPE':
+            array_size = next((e.text for e in elem.iter() if _local_name(e.tag) == 'ARRAY-SIZE'), None)
+            base_ref = next((e.text for e in elem.iter() if _local_name(e.tag) == 'BASE-TYPE-REF'), '')
+            data_types[_odx_child_text(elem, 'SHORT-NAME')] = (
+                ('string', array_size) if _odx_child_text(elem, 'CATEGORY') == 'ARRAY'
+                else (base_ref.rpartition('/')[2], None))
+        elif tag == 'DIAGNOSTIC-ACCESS-PERMISSION':
+            texts = defaultdict(list)
+            for e in elem.iter():
+                if e.text and _local_name(e.tag).endswith('-REF'):
+                    texts[_local_name(e.tag)].append(e.text.rpartition('/')[2])
+            permissions.append(texts)
+        else:
+            continue
+        elem.clear()
+
+    access = defaultdict(dict)
+    for texts in permissions:
+        is_write = texts['SERVICE-REF'] == [WRITE_SERVICE_REF.rpartition('/')[2]]
+        session = texts['SESSION-REF'][0].replace("_", " ") if texts['SESSION-REF'] else "Default Session"
+        security = texts['SECURITY-LEVEL-REF'][0].replace("_", " ") if texts['SECURITY-LEVEL-REF'] else "No Security"
+        for did_name in texts['DIAG-DATA-IDENTIFIER-REF']:
+            if is_write:
+                access[did_name].update(write_enabled=True, write_session=session, write_security=security)
+            else:
+                access[did_name].update(read_enabled=True, session=session, security=security)
+
+    for did_name, (did_dec, element_names) in sorted(dids.items(), key=lambda item: (item[1][0], item[0])):
+        signals = []
+        for element_name in element_names:
+            data_type, size = data_types.get(prototypes.get(element_name), ('uint8', None))
+            signals.append({
+                "name": element_name[len(did_name) + 1:] if element_name.startswith(f"{did_name}_") else element_name,
+                "type": data_type,
+                "size": size or str(DextGeneratorApp.TYPE_SIZE_MAP.get(data_type, 1))
+            })
+        did_info = {"id": format(did_dec, 'X'), "read_enabled": False,
+                    "session": "Default Session", "security": "No Security",
+                    "write_enabled": False, "write_session": "Extended Session",
+                    "write_security": "Level 1", "signals": signals}
+        did_info.update(access[did_name])
+        yield did_name, did_info
+
+
+def _csv_sorted_by_did_id(filepath):
+    """Checks, reading only the DID columns, whether a CSV lists its DIDs
+    grouped and in ascending (DID ID, name) order."""
+    with open(filepath, mode='r', encoding='utf-8') as f:
+        previous_key = None
+        for row in csv.DictReader(f):
+            did_name = row.get('DID_Name')
+            if not did_name or (previous_key and did_name == previous_key[1]):
+                continue
+            key = (int(row['DID_ID'], 16), did_name)
+            if previous_key is not None and key <= previous_key:
+                return False
+            previous_key = key
+    return True
+
+
+def _iter_source_dids(filepath, presorted):
+    """Yields (did_id, did_name, did_info) for one source in ascending DID ID order."""
+    if os.path.splitext(filepath)[1].lower() == '.arxml':
+        items = _iter_arxml_dids(filepath)
+    elif presorted or (presorted is None and _csv_sorted_by_did_id(filepath)):
+        items = _iter_csv_dids(filepath)
+    else:
+        items = sorted(read_dids_csv(filepath).items(), key=lambda item: _did_sort_key(*item))
+
+    previous_key = None
+    for did_name, did_info in items:
+        key = _did_sort_key(did_name, did_info)
+        if previous_key is not None and key <= previous_key:
+            raise UnsortedSourceError(
+                f"'{filepath}' is not sorted by DID ID (DID '{did_name}' follows '{previous_key[1]}')")
+        previous_key = key
+        yield key[0], did_name, did_info
+
+
+def _ranked_source_stream(source, rank, presorted):
+    """Heap entries (did_id, rank, did_name, source, did_info); rank breaks ties between sources."""
+    for did_id, did_name, did_info in _iter_source_dids(source, presorted):
+        yield did_id, rank, did_name, source, did_info
+
+
+def _did_field_values(did_info, fields):
+    """Comparable values of a field group. Defaults match the generator, and
+    settings that do not reach the output (sizes of fixed-size types,
+    sessions of disabled access) are ignored."""
+    read_enabled = did_info.get('read_enabled', True)
+    write_enabled = did_info.get('write_enabled', False)
+    values = []
+    for field in fields:
+        if field == 'signals':
+            value = tuple((s['name'], s['type'],
+                           str(s['size']) if s['type'].lower() == 'string' else None)
+                          for s in did_info.get('signals', []))
+        elif field == 'read_enabled':
+            value = read_enabled
+        elif field == 'write_enabled':
+            value = write_enabled
+        elif field in ('session', 'security'):
+            value = did_info.get(field) if read_enabled else None
+        else:
+            value = did_info.get(field) if write_enabled else None
+        values.append(value)
+    return tuple(values)
+
+
+def merge_did_sources(sources, precedence=None, field_precedence=None, presorted=True):
+    """Merges DID sources (CSV or DEXT ARXML paths) in one k-way pass keyed by DID ID.
+
+    precedence lists the sources from highest to lowest priority (default:
+    the order given). field_precedence optionally overrides it per field
+    group of MERGE_FIELD_GROUPS, e.g. {'access': [...]} to take access rights
+    from another supplier than the signals. With presorted=True CSV sources
+    are streamed and must be sorted by numeric DID ID (UnsortedSourceError
+    otherwise); with presorted=False each CSV is loaded and sorted first.
+    presorted=None checks each CSV up front and only loads and sorts the
+    ones that are not in order.
+
+    Returns (dids_data, conflicts), where each conflict is a dict with
+    did_id, kind ('name', 'signals', 'access' or 'duplicate_name'),
+    sources, values and the winning source.
+    """
+    precedence = list(precedence or sources)
+    rank = {source: precedence.index(source) if source in precedence else len(precedence) + i
+            for i, source in enumerate(sources)}
+    field_rank = {
+        group: {source: order.index(source) if source in order else len(order) + rank[source]
+                for source in sources}
+        for group, order in (field_precedence or {}).items()
+    }
+
+    streams = [_ranked_source_stream(source, (rank[source], index), presorted)
+               for index, source in enumerate(sources)]
+
+    merged, conflicts, name_owner = {}, [], {}
+    for did_id, group in itertools.groupby(heapq.merge(*streams), key=lambda entry: entry[0]):
+        # (did_name, source, did_info), already ordered by source precedence
+        candidates = [entry[2:] for entry in group]
+        candidate_sources = [source for _, source, _ in candidates]
+        did_hex = format(did_id, 'X')
+        did_name, winner_source, winner_info = candidates[0]
+
+        did_info = winner_info
+        if len(candidates) > 1:
+            names = [name for name, _, _ in candidates]
+            if len(set(names)) > 1:
+                conflicts.append({"did_id": did_hex, "kind": "name",
+                                  "sources": candidate_sources,
+                                  "values": names, "winner": winner_source})
+
+            did_info = dict(winner_info)
+            for group_name, fields in MERGE_FIELD_GROUPS.items():
+                values = [_did_field_values(info, fields) for _, _, info in candidates]
+                if len(fields) == 1:
+                    values = [value[0] for value in values]
+                group_source = winner_source
+                if group_name in field_rank:
+                    _, group_source, group_info = min(
+                        candidates, key=lambda entry: field_rank[group_name][entry[1]])
+                    did_info.update((field, group_info[field]) for field in fields
+                                    if field in group_info)
+                if len(set(values)) > 1:
+                    conflicts.append({"did_id": did_hex, "kind": group_name,
+                                      "sources": candidate_sources,
+                                      "values": values, "winner": group_source})
+
+        if did_name in name_owner:
+            conflicts.append({"did_id": did_hex, "kind": "duplicate_name",
+                              "sources": [winner_source],
+                              "values": [f"'{did_name}' already used by ID {name_owner[did_name]}"],
+                              "winner": winner_source})
+            did_name = f"{did_name}_{did_hex}"
+        name_owner[did_name] = did_hex
+        merged[did_name] = did_info
+    return merged, conflicts
+
+
+def format_merge_conflicts(conflicts, limit=20):
+    lines = [f"ID {c['did_id']}: {c['kind']} differs between "
+             f"{', '.join(os.path.basename(s) for s in c['sources'])}; "
+             f"kept {os.path.basename(c['winner'])}"
+             for c in conflicts[:limit]]
+    if len(conflicts) > limit:
+        lines.append(f"... and {len(conflicts) - limit} more.")
+    return "\n".join(lines) if lines else "No conflicts."
+
+
+# --- ARXML Reference Checking ---
+def check_arxml_references(source, external_paths=EXTERNAL_REFERENCE_PATHS):
+    """Checks every *-REF / *-TREF in an ARXML file (path or file object) against
+    the SHORT-NAME paths it defines, in one streaming pass.
+
+    Returns a dict with the number of paths and references seen, the dangling
+    references as (owner_path, ref_tag, target) tuples and the duplicate paths.
+    """
+    paths = set()
+    duplicates = []
+    pending = []  # References whose target had not been defined yet when seen
+    reference_count = 0
+    stack = []  # [element, short_name] for every open element
+
+    def current_path():
+        return '/' + '/'.join(name for _, name in stack if name)
+
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append([elem, None])
+            continue
+        stack.pop()
+        tag = _local_name(elem.tag)
+        text = elem.text.strip() if elem.text else ''
+
+        if tag == 'SHORT-NAME' and stack:
+            stack[-1][1] = text
+            path = current_path()
+            if path in paths:
+                duplicates.append(path)
+            else:
+                paths.add(path)
+        elif (tag.endswith('-REF') or tag.endswith('-TREF')) and text:
+            reference_count += 1
+            if text not in paths:
+                pending.append((current_path(), tag, text))
+
+        # Free the processed subtree and drop it from its parent. The parser may
+        # already have appended later siblings, so remove by identity.
+        elem.clear()
+        if stack:
+            stack[-1][0].remove(elem)
+
+    dangling = [ref for ref in pending
+                if ref[2] not in paths and ref[2] not in external_paths]
+    return {"paths": len(paths), "references": reference_count,
+            "dangling": dangling, "duplicates": duplicates}
+
+
+def format_reference_report(report, limit=20):
+    """Formats the problems of a check_arxml_references report for display."""
+    lines = []
+    for owner_path, ref_tag, target in report["dangling"][:limit]:
+        lines.append(f"Dangling {ref_tag} in {owner_path}: {target}")
+    for path in report["duplicates"][:limit]:
+        lines.append(f"Duplicate path: {path}")
+    hidden = (max(0, len(report["dangling"]) - limit)
+              + max(0, len(report["duplicates"]) - limit))
+    if hidden:
+        lines.append(f"... and {hidden} more.")
+    return "\n".join(lines) if lines else "No dangling references or duplicate paths found."
+
+
+# --- DEXT Generation ---
+def find_duplicate_did_ids(dids_data):
+    """Returns {original_id: [did_names]} for every DID ID used by more than one DID."""
+    id_to_names = defaultdict(list)
+    for did_name, data in dids_data.items():
+        did_id = data.get('id', '').strip()
+        if did_id:
+            # Normalize to handle potential case differences e.g., 'F100' vs 'f100'
+            id_to_names[did_id.lower()].append(did_name)
+
+    # Report the ID with its original casing from the first DID that uses it
+    return {
+        dids_data[names[0]].get('id', id_val): names
+        for id_val, names in id_to_names.items() if len(names) > 1
+    }
+
+
+def format_duplicate_did_ids(duplicates):
+    return "".join(f"ID '{did_id}' is used by DIDs: {', '.join(did_names)}\n"
+                   for did_id, did_names in duplicates.items())
+
+
+def _xml_escape(data):
+    return (data.replace("&", "&amp;").replace("<", "&lt;")
+            .replace("\"", "&quot;").replace(">", "&gt;"))
+
+
+def _write_pretty_xml(elem, level, parts):
+    indent = "    " * level
+    attrs = "".join(f' {key}="{_xml_escape(value)}"' for key, value in elem.attrib.items())
+    if len(elem):
+        parts.append(f"{indent}<{elem.tag}{attrs}>\n")
+        for child in elem:
+            _write_pretty_xml(child, level + 1, parts)
+        parts.append(f"{indent}</{elem.tag}>\n")
+    elif elem.text:
+        parts.append(f"{indent}<{elem.tag}{attrs}>{_xml_escape(elem.text)}</{elem.tag}>\n")
+    else:
+        parts.append(f"{indent}<{elem.tag}{attrs}/>\n")
+
+
+def _pretty_xml(elements, level):
+    """Serializes elements exactly like minidom's toprettyxml(indent="    ")
+    would at the given nesting depth, so fragments can be concatenated."""
+    parts = []
+    for elem in elements:
+        _write_pretty_xml(elem, level, parts)
+    return "".join(parts)
+
+
+def _did_fragment_key(did_name, data):
+    """Hashable snapshot of every DID field that influences the generated XML."""
+    return (did_name, data['id'],
+            data.get("read_enabled", True), data.get('session'), data.get('security'),
+            data.get("write_enabled"), data.get("write_session"), data.get("write_security"),
+            tuple((s['name'], s['type'], s['size']) for s in data['signals']))
+
+
+class DextGenerator:
+    """Builds the DEXT ARXML document for a DID data dictionary.
+
+    Every DID is serialized into text fragments that are cached by content,
+    so regenerating a model in which only a few DIDs changed rebuilds just
+    those DIDs. The cache is safe to share between threads.
+    """
+
+    ELEMENT_LEVEL = 4  # AUTOSAR / AR-PACKAGES / AR-PACKAGE / ELEMENTS / <element>
+
+    def __init__(self, max_fragments=FRAGMENT_CACHE_LIMIT):
+        self.max_fragments = max_fragments
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+        # Create common access control objects
+        common = []
+        for session_name in ("Default_Session", "Extended_Session", "Programming_Session"):
+            session = ET.Element("DIAGNOSTIC-SESSION-CONTROL")
+            ET.SubElement(session, "SHORT-NAME").text = session_name
+            common.append(session)
+        for security_name in ("No_Security", "Level_1", "Level_2"):
+            security = ET.Element("DIAGNOSTIC-SECURITY-LEVEL")
+            ET.SubElement(security, "SHORT-NAME").text = security_name
+            common.append(security)
+        self._common_access_xml = _pretty_xml(common, self.ELEMENT_LEVEL)
+
+    def cache_stats(self):
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {"hits": self.cache_hits,
+                    "misses": self.cache_misses,
+                    "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+                    "size": len(self._fragments)}
+
+    def generate(self, dids_data, group_permissions=False):
+        """Returns the pretty-printed ARXML document as UTF-8 bytes."""
+        return self._assemble(
+            ((did_name, self._did_fragment(did_name, data))
+             for did_name, data in dids_data.items()),
+            group_permissions)
+
+    def generate_variants(self, base, overlays, group_permissions=False):
+        """Yields (variant_name, ARXML bytes) for each overlay applied to the base DIDs.
+
+        The base fragments are looked up once; a variant only rebuilds the DIDs
+        its overlay added or changed, since untouched DIDs are the very same
+        objects as in the base (see apply_overlay).
+        """
+        base_fragments = {did_name: self._did_fragment(did_name, data)
+                          for did_name, data in base.items()}
+        for variant_name, overlay in overlays.items():
+            variant = apply_overlay(base, overlay)
+            yield variant_name, self._assemble(
+                ((did_name,
+                  base_fragments[did_name] if base.get(did_name) is data
+                  else self._did_fragment(did_name, data))
+                 for did_name, data in variant.items()),
+                group_permissions)
+
+    def _assemble(self, did_fragments, group_permissions):
+        did_parts, element_parts, type_parts = [], [], []
+        access_parts = [self._common_access_xml]
+        # Key: (access, service, session, security) -> DIDs sharing that combination
+        permission_index = defaultdict(list)
+
+        for did_name, fragment in did_fragments:
+            did_xml, elements_xml, types_xml, permission_keys, access_xml = fragment
+            did_parts.append(did_xml)
+            element_parts.append(elements_xml)
+            type_parts.append(types_xml)
+            if group_permissions:
+                for key in permission_keys:
+                    permission_index[key].append(did_name)
+            else:
+                access_parts.append(access_xml)
+
+        # --- Create one shared Access Permission per distinct combination ---
+        # Session and security names may themselves contain underscores, so they
+        # cannot be joined into an unambiguous SHORT-NAME; number them instead.
+        counters = defaultdict(itertools.count)
+        access_parts.append(_pretty_xml(
+            (self._create_access_permission(f"{access}_Access_{next(counters[access])}",
+                                            service_ref, did_names, session, security)
+             for (access, service_ref, session, security), did_names in permission_index.items()),
+            self.ELEMENT_LEVEL))
+
+        parts = ['<?xml version="1.0" encoding="utf-8"?>\n',
+                 f'<AUTOSAR xmlns:ns0="{XSI_NAMESPACE}" ns0:schemaLocation="{SCHEMA_LOCATION}">\n',
+                 '    <AR-PACKAGES>\n']
+        for short_name, package_parts in (("MyECU_DiagnosticExtract", did_parts),
+                                          ("MyECU_DataElements", element_parts),
+                                          ("MyECU_DataTypes", type_parts),
+                                          ("MyECU_AccessPermissions", access_parts)):
+            self._write_ar_package(short_name, package_parts, parts)
+        parts.append('    </AR-PACKAGES>\n</AUTOSAR>\n')
+        return "".join(parts).encode("utf-8")
+
+    def _write_ar_package(self, short_name, package_parts, parts):
+        parts.append("        <AR-PACKAGE>\n"
+                     f"            <SHORT-NAME>{_xml_escape(short_name)}</SHORT-NAME>\n")
+        if any(package_parts):
+            parts.append("            <ELEMENTS>\n")
+            parts.extend(package_parts)
+            parts.append("            </ELEMENTS>\n")
+        else:
+            parts.append("            <ELEMENTS/>\n")
+        parts.append("        </AR-PACKAGE>\n")
+
+    def _did_fragment(self, did_name, data):
+        key = _did_fragment_key(did_name, data)
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self.cache_hits += 1
+                return fragment
+            self.cache_misses += 1
+
+        fragment = self._build_did_fragment(did_name, data)
+        with self._lock:
+            if len(self._fragments) >= self.max_fragments:
+                self._fragments.clear()
+            self._fragments[key] = fragment
+        return fragment
+
+    def _build_did_fragment(self, did_name, data):
+        """Returns (did_xml, data_elements_xml, data_types_xml, permission_keys, access_xml)."""
+        data_elements_package = ET.Element("ELEMENTS")
+        data_types_package = ET.Element("ELEMENTS")
+        access_perms_package = ET.Element("ELEMENTS")
+
+        did_dec = str(int(data['id'], 16))
+        did_element = ET.Element("DIAGNOSTIC-DATA-IDENTIFIER")
+        ET.SubElement(did_element, "SHORT-NAME").text = did_name
+        ET.SubElement(did_element, "ID").text = did_dec
+        data_element_refs = ET.SubElement(did_element, "DATA-ELEMENT-REFS")
+
+        for signal in data['signals']:
+            signal_name = signal['name']
+            # Make short-names unique by prepending DID name to avoid conflicts
+            unique_element_name = f"{did_name}_{signal_name}"
+
+            data_element = ET.SubElement(
+                data_elements_package, "DATA-ELEMENT-PROTOTYPE")
+            ET.SubElement(data_element,
+                          "SHORT-NAME").text = unique_element_name
+            type_name = self._create_implementation_data_type(
+                data_types_package, signal, unique_element_name)
+            ET.SubElement(data_element,
+                          "TYPE-TREF",
+                          DEST="IMPLEMENTATION-DATA-TYPE"
+                          ).text = f"/MyECU_DataTypes/{type_name}"
+            ET.SubElement(data_element_refs,
+                          "DATA-ELEMENT-REF",
+                          DEST="DATA-ELEMENT-PROTOTYPE"
+                          ).text = f"/MyECU_DataElements/{unique_element_name}"
+
+        # --- Collect Read/Write Access Permissions ---
+        permission_keys = []
+        if data.get("read_enabled", True):  # Default to True for backward compatibility
+            session = data['session'].replace(" ", "_")
+            security = data['security'].replace(" ", "_")
+            permission_keys.append(("Read", READ_SERVICE_REF, session, security))
+
+        if data.get("write_enabled"):
+            write_session = data.get("write_session", "Default Session").replace(" ", "_")
+            write_security = data.get("write_security", "No Security").replace(" ", "_")
+            permission_keys.append(("Write", WRITE_SERVICE_REF, write_session, write_security))
+
+        for access, service_ref, session, security in permission_keys:
+            access_perms_package.append(self._create_access_permission(
+                f"{did_name}_{access}_Access", service_ref, [did_name], session, security))
+
+        level = self.ELEMENT_LEVEL
+        return (_pretty_xml([did_element], level),
+                _pretty_xml(data_elements_package, level),
+                _pretty_xml(data_types_package, level),
+                tuple(permission_keys),
+                _pretty_xml(access_perms_package, level))
+
+    def _create_access_permission(self, short_name, service_ref,
+                                  did_names, session, security):
+        access_perm = ET.Element("DIAGNOSTIC-ACCESS-PERMISSION")
+        ET.SubElement(access_perm, "SHORT-NAME").text = short_name
+        ET.SubElement(access_perm, "SERVICE-REF",
+                      DEST="DIAGNOSTIC-SERVICE-CLASS").text = service_ref
+        did_refs = ET.SubElement(access_perm, "DIAG-DATA-IDENTIFIER-REFS")
+        for did_name in did_names:
+            ET.SubElement(did_refs,
+                          "DIAG-DATA-IDENTIFIER-REF",
+                          DEST="DIAGNOSTIC-DATA-IDENTIFIER"
+                          ).text = f"/MyECU_DiagnosticExtract/{did_name}"
+        ET.SubElement(ET.SubElement(access_perm, "SESSIONS"),
+                      "SESSION-REF",
+                      DEST="DIAGNOSTIC-SESSION-CONTROL"
+                      ).text = f"/MyECU_AccessPermissions/{session}"
+        ET.SubElement(ET.SubElement(access_perm, "SECURITY-LEVELS"),
+                      "SECURITY-LEVEL-REF",
+                      DEST="DIAGNOSTIC-SECURITY-LEVEL"
+                      ).text = f"/MyECU_AccessPermissions/{security}"
+        return access_perm
+
+    def _create_implementation_data_type(self, parent, signal_info,
+                                         unique_prefix):
+        data_type = signal_info['type']
+        size = signal_info['size']
+        short_name = f"{unique_prefix}_Type"
+
+        if data_type.lower() == 'string':
+            impl_data_type = ET.SubElement(parent, "IMPLEMENTATION-DATA-TYPE")
+            ET.SubElement(impl_data_type, "SHORT-NAME").text = short_name
+            ET.SubElement(impl_data_type, "CATEGORY").text = "ARRAY"
+            sub_elements = ET.SubElement(impl_data_type, "SUB-ELEMENTS")
+            element = ET.SubElement(sub_elements,
+                                    "IMPLEMENTATION-DATA-TYPE-ELEMENT")
+            ET.SubElement(
+                element, "SHORT-NAME").text = f"{unique_prefix}_Byte"
+            ET.SubElement(element, "CATEGORY").text = "TYPE_REFERENCE"
+            ET.SubElement(element, "ARRAY-SIZE").text = str(size)
+            props = ET.SubElement(element, "SW-DATA-DEF-PROPS")
+            variants = ET.SubElement(props, "SW-DATA-DEF-PROPS-VARIANTS")
+            cond = ET.SubElement(variants, "SW-DATA-DEF-PROPS-CONDITIONAL")
+            ET.SubElement(
+                cond,
+                "IMPLEMENTATION-DATA-TYPE-REF",
+                DEST="IMPLEMENTATION-DATA-TYPE"
+            ).text = "/AUTOSAR_Platform/ImplementationDataTypes/uint8"
+        else:
+            impl_data_type = ET.SubElement(parent, "IMPLEMENTATION-DATA-TYPE")
+            ET.SubElement(impl_data_type, "SHORT-NAME").text = short_name
+            ET.SubElement(impl_data_type, "CATEGORY").text = "VALUE"
+            props = ET.SubElement(impl_data_type, "SW-DATA-DEF-PROPS")
+            variants = ET.SubElement(props, "SW-DATA-DEF-PROPS-VARIANTS")
+            cond = ET.SubElement(variants, "SW-DATA-DEF-PROPS-CONDITIONAL")
+            ET.SubElement(
+                cond, "BASE-TYPE-REF", DEST="IMPLEMENTATION-DATA-TYPE"
+            ).text = f"/AUTOSAR_Platform/ImplementationDataTypes/{data_type}"
+
+        return short_name
+
+
+# --- UDS Payload Codec ---
+class DidCodec:
+    """Precompiled big-endian codec for the data record of one DID.
+
+    The signal list is compiled once into a struct.Struct (and a NumPy
+    structured dtype when NumPy is installed). String signals are fixed-size
+    byte fields and decode to bytes.
+    """
+
+    def __init__(self, did_name, did_data):
+        self.name = did_name
+        self.did_id = int(did_data['id'], 16)
+        self.signal_names = [signal['name'] for signal in did_data.get('signals', [])]
+
+        formats, numpy_fields = [], []
+        for signal in did_data.get('signals', []):
+            signal_type = signal.get('type', '').lower()
+            if signal_type == 'string':
+                size = int(signal.get('size', 0))
+                formats.append(f"{size}s")
+                numpy_fields.append((signal['name'], f"S{size}"))
+            elif signal_type in STRUCT_FORMATS:
+                formats.append(STRUCT_FORMATS[signal_type])
+                numpy_fields.append((signal['name'], NUMPY_FORMATS[signal_type]))
+            else:
+                raise ValueError(f"Signal '{signal['name']}' of DID '{did_name}' "
+                                 f"has unsupported type '{signal.get('type')}'")
+
+        self.payload_struct = struct.Struct(">" + "".join(formats))
+        self.response_struct = struct.Struct(">BH" + "".join(formats))
+        self.response_prefix = struct.pack(">BH", UDS_READ_DATA_BY_IDENTIFIER_RESPONSE,
+                                           self.did_id)
+        self.response_dtype = None
+        if np is not None:
+            self.response_dtype = np.dtype([('_sid', 'u1'), ('_did', '>u2')] + numpy_fields)
+
+    @property
+    def payload_size(self):
+        return self.payload_struct.size
+
+    @property
+    def response_size(self):
+        return self.response_struct.size
+
+    def _values(self, values):
+        if isinstance(values, dict):
+            values = [values[name] for name in self.signal_names]
+        return [value.encode('utf-8') if isinstance(value, str) else value
+                for value in values]
+
+    def encode(self, values):
+        """Packs signal values (a dict by signal name, or a sequence in signal order) into the data record."""
+        return self.payload_struct.pack(*self._values(values))
+
+    def decode(self, payload):
+        """Unpacks a data record into {signal_name: value}."""
+        return dict(zip(self.signal_names, self.payload_struct.unpack(payload)))
+
+    def encode_response(self, values):
+        """Builds a complete ReadDataByIdentifier positive response (0x62, DID, record)."""
+        return self.response_prefix + self.encode(values)
+
+    def decode_response(self, frame):
+        if frame[:3] != self.response_prefix:
+            raise ValueError(f"Frame is not a ReadDataByIdentifier response for DID '{self.name}'")
+        return dict(zip(self.signal_names, self.response_struct.unpack(frame)[2:]))
+
+    def decode_responses(self, buffer):
+        """Decodes back-to-back response frames of this DID into {signal_name: column}.
+
+        With NumPy the columns are views into the buffer (np.frombuffer);
+        otherwise they are tuples built by struct.iter_unpack.
+        """
+        view = memoryview(buffer).cast('B')
+        if len(view) % self.response_size:
+            raise ValueError(f"Buffer length {len(view)} is not a multiple of the "
+                             f"{self.response_size}-byte response of DID '{self.name}'")
+
+        if self.response_dtype is not None:
+            records = np.frombuffer(view, dtype=self.response_dtype)
+            if not ((records['_sid'] == UDS_READ_DATA_BY_IDENTIFIER_RESPONSE).all()
+                    and (records['_did'] == self.did_id).all()):
+                raise ValueError(f"Buffer contains frames that are not responses for DID '{self.name}'")
+            return {name: records[name] for name in self.signal_names}
+
+        # Compare the header bytes of all frames at once through strided slices
+        count = len(view) // self.response_size
+        if any(view[i::self.response_size] != self.response_prefix[i:i + 1] * count
+               for i in range(len(self.response_prefix))):
+            raise ValueError(f"Buffer contains frames that are not responses for DID '{self.name}'")
+        columns = list(zip(*self.response_struct.iter_unpack(view)))
+        if not columns:
+            return {name: () for name in self.signal_names}
+        return dict(zip(self.signal_names, columns[2:]))
+
+
+def compile_did_codecs(dids_data):
+    """Returns {numeric DID ID: DidCodec} for every DID in the model."""
+    return {codec.did_id: codec
+            for codec in (DidCodec(did_name, data) for did_name, data in dids_data.items())}
+
+
+def _concat_columns(decoded_runs):
+    if len(decoded_runs) == 1:
+        return decoded_runs[0]
+    if np is not None:
+        return {name: np.concatenate([run[name] for run in decoded_runs])
+                for name in decoded_runs[0]}
+    return {name: tuple(value for run in decoded_runs for value in run[name])
+            for name in decoded_runs[0]}
+
+
+def decode_response_log(filepath, codecs, log_format=None):
+    """Decodes a log of ReadDataByIdentifier responses into
+    {did_name: {signal_name: column}}.
+
+    log_format is 'binary' (frames back to back) or 'hex' (hex text, split
+    into lines however the logger likes); by default it follows the file
+    extension (see HEX_LOG_EXTENSIONS). Negative responses are skipped. A
+    log of a single DID is decoded in one DidCodec.decode_responses call;
+    other logs are first split into contiguous per-DID runs, which are then
+    decoded in bulk.
+    """
+    if log_format is None:
+        is_hex = os.path.splitext(filepath)[1].lower() in HEX_LOG_EXTENSIONS
+        log_format = 'hex' if is_hex else 'binary'
+    if log_format not in ('binary', 'hex'):
+        raise ValueError(f"Unknown log format '{log_format}'")
+
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    if log_format == 'hex':
+        raw = bytes.fromhex(raw.decode('ascii'))  # Whitespace and line breaks are skipped
+
+    runs = defaultdict(list)
+    if raw:
+        view = memoryview(raw)
+        # Most logs poll a single DID: validate and decode them in one bulk call
+        codec = codecs.get(int.from_bytes(raw[1:3], 'big'))
+        if codec is not None and not len(raw) % codec.response_size:
+            try:
+                return {codec.name: codec.decode_responses(view)}
+            except ValueError:
+                pass  # Mixed DIDs or negative responses; split into runs below
+
+        offset = 0
+        while offset < len(raw):
+            if raw[offset] == UDS_NEGATIVE_RESPONSE:
+                offset += 3
+                continue
+            did_id = int.from_bytes(raw[offset + 1:offset + 3], 'big')
+            codec = codecs.get(did_id)
+            if codec is None or raw[offset] != UDS_READ_DATA_BY_IDENTIFIER_RESPONSE:
+                raise ValueError(f"Unknown response frame at byte offset {offset}")
+            # Extend the run over consecutive frames of the same DID
+            run_start = offset
+            while raw.startswith(codec.response_prefix, offset):
+                offset += codec.response_size
+            runs[did_id].append(view[run_start:offset])
+
+    decoded = {}
+    for did_id, buffers in runs.items():
+        codec = codecs.get(did_id)
+        if codec is None:
+            raise ValueError(f"Log contains responses for unknown DID 0x{did_id:04X}")
+        decoded[codec.name] = _concat_columns([codec.decode_responses(b) for b in buffers])
+    return decoded
+
+
+# --- Autosave Journal ---
+class AutosaveJournal:
+    """Append-only journal of DID edits with periodic compaction into a snapshot.
+
+    Each edit is one JSON line: ["u", original_name, new_name, data] or
+    ["d", did_name]. The snapshot (plain JSON, so loading a planted file
+    cannot run code) is the base the journal is replayed onto; it is written
+    on the first edit after a load or save, and again every compact_every
+    records, after which the journal is truncated. Replaying records onto a
+    snapshot that already contains them is harmless, so a crash between the
+    two steps loses nothing.
+
+    The files sit next to the project file, or in DEXT_RUNTIME_DIR while the
+    model is untitled, and carry a per-session ID. From its first snapshot on,
+    a session holds an exclusive lock on its .lock file, so other instances
+    can tell a running session's autosave from one whose owner has exited or
+    crashed; only the latter are offered for recovery or discarded.
+    """
+
+    def __init__(self, project_path=None, compact_every=AUTOSAVE_COMPACT_EVERY):
+        self.compact_every = compact_every
+        self.pending = 0  # Records appended since the last snapshot
+        self._journal = None
+        self._lock_file = None
+        self.snapshot_path = self.journal_path = None
+        self.set_project(project_path)
+
+    @staticmethod
+    def _prefix(project_path):
+        if project_path:
+            directory, name = os.path.split(os.path.abspath(project_path))
+        else:
+            directory, name = DEXT_RUNTIME_DIR, "untitled"
+        return os.path.join(directory, f".{name}.")
+
+    @classmethod
+    def find(cls, project_path=None):
+        """Returns the snapshots that exited sessions left for project_path, newest first."""
+        pattern = f"{glob.escape(cls._prefix(project_path))}*{AUTOSAVE_SUFFIX}.snapshot"
+        orphaned = []
+        for snapshot_path in glob.glob(pattern):
+            lock_file = cls._claim(snapshot_path)
+            if lock_file is not None:
+                lock_file.close()
+                orphaned.append(snapshot_path)
+        return sorted(orphaned, key=os.path.getmtime, reverse=True)
+
+    @staticmethod
+    def _journal_for(snapshot_path):
+        return snapshot_path[:-len(".snapshot")] + ".journal"
+
+    @staticmethod
+    def _lock_for(snapshot_path):
+        return snapshot_path[:-len(".snapshot")] + ".lock"
+
+    @classmethod
+    def _claim(cls, snapshot_path):
+        """Locks the session lock of snapshot_path and returns the open lock
+        file, or None while the session that wrote it is still running."""
+        lock_file = open(cls._lock_for(snapshot_path), 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    @classmethod
+    def discard(cls, snapshot_path):
+        """Deletes an exited session's autosave; refuses while its owner is running."""
+        lock_file = cls._claim(snapshot_path)
+        if lock_file is None:
+            raise OSError(f"Autosave '{snapshot_path}' belongs to a running session")
+        lock_file.close()  # Windows cannot delete a file that is still open
+        cls._remove_files(snapshot_path)
+
+    @classmethod
+    def _remove_files(cls, snapshot_path):
+        for path in (snapshot_path, cls._journal_for(snapshot_path), cls._lock_for(snapshot_path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def set_project(self, project_path):
+        """Discards this session's autosave and continues next to project_path (None: untitled)."""
+        self.clear()
+        base = f"{self._prefix(project_path)}{os.getpid()}-{time.time_ns()}{AUTOSAVE_SUFFIX}"
+        self.snapshot_path = f"{base}.snapshot"
+        self.journal_path = self._journal_for(self.snapshot_path)
+
+    def has_data(self):
+        return os.path.exists(self.snapshot_path)
+
+    def record_update(self, dids_data, original_name, new_name, data):
+        """Journals an edit that has already been applied to dids_data."""
+        self._record(dids_data, ["u", original_name, new_name, data])
+
+    def record_delete(self, dids_data, did_name):
+        """Journals a deletion that has already been applied to dids_data."""
+        self._record(dids_data, ["d", did_name])
+
+    def _record(self, dids_data, record):
+        if not self.has_data():
+            # No base to replay onto yet: the snapshot already contains this edit
+            self.write_snapshot(dids_data)
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self._journal.flush()
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.write_snapshot(dids_data)
+
+    def write_snapshot(self, dids_data):
+        """Atomically replaces the snapshot with dids_data and empties the journal."""
+        if self._lock_file is None:
+            # Claimed before the snapshot appears, so it is never seen unlocked
+            os.makedirs(os.path.dirname(self.snapshot_path), mode=0o700, exist_ok=True)
+            self._lock_file = self._claim(self.snapshot_path)
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dids_data, f, separators=(',', ':'))
+        os.replace(temp_path, self.snapshot_path)
+
+        self.close()
+        open(self.journal_path, 'w').close()
+        self.pending = 0
+
+    def recover(self, snapshot_path):
+        """Rebuilds the model from another session's snapshot + journal and adopts it.
+
+        The result becomes this session's snapshot and the old files are
+        removed, so a torn final record is never appended to. Raises OSError
+        if the owning session is still running.
+        """
+        lock_file = self._claim(snapshot_path)
+        if lock_file is None:
+            raise OSError(f"Autosave '{snapshot_path}' belongs to a running session")
+        try:
+            dids_data = self._replay(snapshot_path)
+            self.write_snapshot(dids_data)
+        finally:
+            lock_file.close()
+        self._remove_files(snapshot_path)
+        return dids_data
+
+    @classmethod
+    def _replay(cls, snapshot_path):
+        # Millions of small containers are created at once; collecting during the load only costs time
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(snapshot_path, encoding='utf-8') as f:
+                dids_data = json.load(f)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        journal_path = cls._journal_for(snapshot_path)
+        if os.path.exists(journal_path):
+            with open(journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # Torn final record from a crash mid-append
+                    if record[0] == "u":
+                        _, original_name, new_name, data = record
+                        if original_name and original_name != new_name:
+                            dids_data.pop(original_name, None)
+                        dids_data[new_name] = data
+                    elif record[0] == "d":
+                        dids_data.pop(record[1], None)
+        return dids_data
+
+    def clear(self):
+        """Discards the autosave, e.g. once the model has been saved or replaced."""
+        self.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        if self.snapshot_path is not None:
+            self._remove_files(self.snapshot_path)
+        self.pending = 0
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+# --- Resident Generation Server ---
+class _DextRequestHandler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP front end for DextServer."""
+
+    ROUTES = {
+        ("POST", "/project"): "load_project",
+        ("POST", "/generate"): "generate_project",
+        ("POST", "/variants"): "generate_variants",
+        ("GET", "/stats"): "stats",
+    }
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _rejection(self, method):
+        """Returns (status, result) if the request must not be served, else None."""
+        # Browsers send cross-origin text/plain and form posts without a preflight
+        if method == "POST" and self.headers.get_content_type() != "application/json":
+            return 415, {"error": "Content-Type must be application/json"}
+        token = self.server.token
+        if token is not None and not hmac.compare_digest(
+                self.headers.get(DEXT_TOKEN_HEADER, "").encode('utf-8'), token.encode('utf-8')):
+            return 403, {"error": f"Missing or invalid {DEXT_TOKEN_HEADER} header"}
+        return None
+
+    def _dispatch(self, method):
+        start = time.perf_counter()
+        handler_name = self.ROUTES.get((method, self.path))
+        if handler_name is None:
+            status, result = 404, {"error": f"Unknown endpoint {method} {self.path}"}
+        else:
+            status, result = self._rejection(method) or (None, None)
+        if status is None:
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}') if method == "POST" else {}
+                status, result = 200, getattr(self.server, handler_name)(request)
+            except PermissionError as e:
+                status, result = 403, {"error": str(e)}
+            except (KeyError, ValueError, OSError) as e:
+                status, result = 400, {"error": f"{type(e).__name__}: {e}"}
+            except Exception as e:
+                status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        # Keyed by route so that probing unknown paths cannot grow the stats
+        self.server.record_request(handler_name or "unmatched",
+                                   time.perf_counter() - start, status == 200)
+
+        payload = json.dumps(result).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Keep build logs quiet; use /stats instead
+
+
+class DextServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Long-running local server that keeps parsed DID models and the
+    generator's fragment cache in memory between build requests.
+
+    Endpoints (JSON bodies):
+      POST /project   {"project", "csv" | "odx" | "dids", "update", "delete"}
+      POST /generate  {"project", "output", "group_permissions", "check"}
+      POST /variants  {"project", "overlays": [csv paths], "output_dir", "group_permissions"}
+      GET  /stats
+    The server listens on a Unix socket that only its user can open. Where
+    Unix sockets are unavailable it listens on a loopback TCP port instead and
+    requires the per-start token from DEXT_SERVER_TOKEN_FILE with every request.
+    File paths in requests must lie inside the workspace directory.
+    Project models are never mutated in place, so parallel generate requests
+    can read them without holding the lock.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, socket_path=None, host=None, port=DEXT_SERVER_PORT, workspace=None):
+        if host is None and socket_path is None and hasattr(socket, "AF_UNIX"):
+            socket_path = DEXT_SERVER_SOCKET
+        os.makedirs(DEXT_RUNTIME_DIR, mode=0o700, exist_ok=True)
+
+        self.socket_path = socket_path
+        self.token = None
+        if socket_path is not None:
+            self.address_family = socket.AF_UNIX
+            if os.path.exists(socket_path):
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    if probe.connect_ex(socket_path) == 0:
+                        raise OSError(f"A DEXT server is already listening on '{socket_path}'")
+                os.remove(socket_path)  # Left behind by a server that did not shut down cleanly
+            # Created with owner-only permissions; connecting requires write access
+            old_umask = os.umask(0o177)
+            try:
+                super().__init__(socket_path, _DextRequestHandler)
+            finally:
+                os.umask(old_umask)
+        else:
+            host = host or "127.0.0.1"
+            if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+                raise ValueError(f"Refusing to listen on non-loopback address '{host}'")
+            super().__init__((host, port), _DextRequestHandler)
+            self.token = secrets.token_urlsafe(32)
+            fd = os.open(DEXT_SERVER_TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.token)
+
+        self.workspace = os.path.realpath(workspace or os.getcwd())
+        self.generator = DextGenerator()
+        self.projects = {}
+        self.requests_served = 0
+        self.request_errors = 0
+        self._latencies = defaultdict(lambda: [0, 0.0, 0.0])  # count, total, max
+        self._lock = threading.Lock()
+
+    def server_close(self):
+        super().server_close()
+        for path in (self.socket_path, DEXT_SERVER_TOKEN_FILE if self.token else None):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def _workspace_path(self, path, suffix=None):
+        """Resolves a request path, which must stay inside the workspace directory."""
+        resolved = os.path.realpath(os.path.join(self.workspace, path))
+        if os.path.commonpath([resolved, self.workspace]) != self.workspace:
+            raise PermissionError(f"'{path}' is outside the server workspace '{self.workspace}'")
+        if suffix and not resolved.lower().endswith(suffix):
+            raise ValueError(f"'{path}' must be a {suffix} file")
+        return resolved
+
+    def load_project(self, request):
+        """Loads or replaces a project model, then applies optional per-DID updates/deletes."""
+        name = request["project"]
+        if "csv" in request:
+            base = read_dids_csv_parallel(self._workspace_path(request["csv"]))
+        elif "odx" in request:
+            base = read_dids_odx(self._workspace_path(request["odx"]))
+        else:
+            base = request.get("dids")
+
+        with self._lock:
+            dids_data = dict(base if base is not None else self.projects.get(name, {}))
+            dids_data.update(request.get("update", {}))
+            for did_name in request.get("delete", []):
+                dids_data.pop(did_name, None)
+            self.projects[name] = dids_data
+        return {"project": name, "dids": len(dids_data)}
+
+    def generate_project(self, request):
+        """Generates a project's DEXT file; the output is replaced atomically."""
+        with self._lock:
+            dids_data = self.projects[request["project"]]
+        output = self._workspace_path(request["output"], ".arxml")
+        duplicates = find_duplicate_did_ids(dids_data)
+        if duplicates:
+            raise ValueError("Duplicate DID IDs:\n" + format_duplicate_did_ids(duplicates))
+
+        xml = self.generator.generate(
+            dids_data, request.get("group_permissions", GROUP_ACCESS_PERMISSIONS))
+        temp_path = f"{output}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(xml)
+        os.replace(temp_path, output)
+
+        result = {"project": request["project"], "output": output,
+                  "dids": len(dids_data), "bytes": len(xml)}
+        if request.get("check"):
+            report = check_arxml_references(io.BytesIO(xml))
+            result["dangling"] = report["dangling"]
+            result["duplicates"] = report["duplicates"]
+        return result
+
+    def generate_variants(self, request):
+        """Generates <overlay name>.arxml in output_dir for each overlay on top of the project."""
+        with self._lock:
+            base = self.projects[request["project"]]
+        output_dir = self._workspace_path(request["output_dir"])
+        overlays = read_overlays([self._workspace_path(path) for path in request["overlays"]])
+        for variant_name, overlay in overlays.items():
+            duplicates = find_duplicate_did_ids(apply_overlay(base, overlay))
+            if duplicates:
+                raise ValueError(f"Duplicate DID IDs in variant '{variant_name}':\n"
+                                 + format_duplicate_did_ids(duplicates))
+
+        outputs = {}
+        for variant_name, xml in self.generator.generate_variants(
+                base, overlays, request.get("group_permissions", GROUP_ACCESS_PERMISSIONS)):
+            output = os.path.join(output_dir, f"{variant_name}.arxml")
+            temp_path = f"{output}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(xml)
+            os.replace(temp_path, output)
+            outputs[variant_name] = output
+        return {"project": request["project"], "outputs": outputs}
+
+    def stats(self, request=None):
+        with self._lock:
+            latencies = {
+                endpoint: {"count": count,
+                           "avg_ms": 1000 * total / count,
+                           "max_ms": 1000 * longest}
+                for endpoint, (count, total, longest) in self._latencies.items()
+            }
+            return {"requests": self.requests_served,
+                    "errors": self.request_errors,
+                    "projects": {name: len(dids) for name, dids in self.projects.items()},
+                    "fragment_cache": self.generator.cache_stats(),
+                    "latency": latencies}
+
+    def record_request(self, endpoint, seconds, ok):
+        with self._lock:
+            self.requests_served += 1
+            if not ok:
+                self.request_errors += 1
+            entry = self._latencies[endpoint]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DextClient:
+    """Small client for DextServer, for build scripts and local testing.
+
+    Connects the same way the server listens by default: through the Unix
+    socket where available, otherwise over loopback TCP with the token file.
+    """
+
+    def __init__(self, socket_path=None, host=None, port=DEXT_SERVER_PORT, timeout=300):
+        if host is None and socket_path is None and hasattr(socket, "AF_UNIX"):
+            socket_path = DEXT_SERVER_SOCKET
+        self.socket_path = socket_path
+        self.host = host or "127.0.0.1"
+        self.port = port
+        self.timeout = timeout
+        self.token = None
+        if socket_path is None:
+            with open(DEXT_SERVER_TOKEN_FILE) as f:
+                self.token = f.read().strip()
+
+    def _request(self, method, path, payload=None):
+        if self.socket_path is not None:
+            connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        headers = {"Content-Type": "application/json"}
+        if self.token is not None:
+            headers[DEXT_TOKEN_HEADER] = self.token
+        try:
+            connection.request(method, path,
+                               json.dumps(payload).encode('utf-8') if payload is not None else None,
+                               headers)
+            response = connection.getresponse()
+            result = json.loads(response.read())
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise RuntimeError(result.get("error", f"HTTP {response.status}"))
+        return result
+
+    def load_project(self, project, csv_path=None, odx_path=None, dids=None,
+                     update=None, delete=None):
+        payload = {"project": project}
+        if csv_path:
+            payload["csv"] = os.path.abspath(csv_path)
+        if odx_path:
+            payload["odx"] = os.path.abspath(odx_path)
+        if dids is not None:
+            payload["dids"] = dids
+        if update:
+            payload["update"] = update
+        if delete:
+            payload["delete"] = list(delete)
+        return self._request("POST", "/project", payload)
+
+    def generate(self, project, output, group_permissions=GROUP_ACCESS_PERMISSIONS,
+                 check=False):
+        return self._request("POST", "/generate", {
+            "project": project, "output": os.path.abspath(output),
+            "group_permissions": group_permissions, "check": check})
+
+    def generate_variants(self, project, overlay_paths, output_dir,
+                          group_permissions=GROUP_ACCESS_PERMISSIONS):
+        return self._request("POST", "/variants", {
+            "project": project,
+            "overlays": [os.path.abspath(path) for path in overlay_paths],
+            "output_dir": os.path.abspath(output_dir),
+            "group_permissions": group_permissions})
+
+    def stats(self):
+        return self._request("GET", "/stats")
 
 
 class DIDEditorWindow(tk.Toplevel):
     """A Toplevel window for adding or editing a single DID and its signals."""
 
+    AUTOSAR_TYPES = [
+        'uint8', 'uint16', 'uint32', 'uint64', 'sint8', 'sint16', 'sint32',
+        'sint64', 'boolean', 'float32', 'float64', 'string'
+    ]
+
     def __init__(self, parent, scale_factor=1.0, did_data=None, did_name=""):
         super().__init__(parent)
         self.parent = parent
@@ -29,10 +1788,6 @@ class DIDEditorWindow(tk.Toplevel):
         self.did_data = did_data if did_data else {}
         self.original_did_name = did_name
         self.drag_item = None
-        self.AUTOSAR_TYPES = [
-            'uint8', 'uint16', 'uint32', 'uint64', 'sint8', 'sint16', 'sint32',
-            'sint64', 'boolean', 'float32', 'float64', 'string'
-        ]
 
         self.title("DID Editor")
         self.transient(parent)
@@ -391,8 +2146,35 @@ class DextGeneratorApp(ThemedTk):
 
         self.title("DEXT Generator Tool")
         self.dids_data = {}
+        self.project_path = None  # CSV the model was loaded from or saved to
+        self.row_cache = {}  # did_name -> (data, row values, sort keys)
+        self.tree_items = {}  # did_name -> Treeview item id
+        self.sort_column = None
+        self.sort_reverse = False
+        self.generator = DextGenerator()
+        self.autosave = AutosaveJournal()
         self._create_widgets()
         self._center_window()
+        self.after_idle(self._offer_autosave_recovery)
+
+    def _offer_autosave_recovery(self):
+        """Restores unsaved edits to the current project (or to an untitled model)
+        from a previous session that did not save before exiting."""
+        snapshots = AutosaveJournal.find(self.project_path)
+        if not snapshots:
+            return
+        project = f"'{os.path.basename(self.project_path)}'" if self.project_path else "an untitled project"
+        if not messagebox.askyesno(
+                "Recover Unsaved Work",
+                f"Unsaved changes to {project} from a previous session were found. Restore them?"):
+            AutosaveJournal.discard(snapshots[0])
+            return
+        try:
+            self.dids_data = self.autosave.recover(snapshots[0])
+            self._refresh_main_treeview()
+            self.status_var.set(f"Recovered {len(self.dids_data)} DIDs from autosave.")
+        except Exception as e:
+            messagebox.showerror("Error Recovering Autosave", f"An error occurred: {e}")
 
     def _get_dpi_scale(self):
         """Calculates the UI scaling factor based on the system's DPI."""
@@ -483,6 +2265,11 @@ class DextGeneratorApp(ThemedTk):
         self.tree.heading('Total_Size_Bytes', text='Total Size (B)')
         self.tree.column('Total_Size_Bytes', width=int(90 * self.scale_factor), anchor='center')
 
+        # Clicking a heading sorts by that column; clicking it again reverses the order
+        self.column_titles = {col: self.tree.heading(col, 'text') for col in self.columns}
+        for col in self.columns:
+            self.tree.heading(col, command=lambda c=col: self.sort_by_column(c))
+
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", lambda e: self.edit_did())
 
@@ -494,7 +2281,10 @@ class DextGeneratorApp(ThemedTk):
         file_ops_frame = ttk.LabelFrame(button_groups_frame, text="File Operations", padding=scaled_pad_small)
         file_ops_frame.pack(side=tk.LEFT, padx=(0, scaled_pad_small), fill=tk.X, expand=True)
         ttk.Button(file_ops_frame, text="Load from CSV", command=self.load_csv).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
+        ttk.Button(file_ops_frame, text="Import ODX/PDX", command=self.import_odx).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
+        ttk.Button(file_ops_frame, text="Merge Sources", command=self.merge_sources).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
         ttk.Button(file_ops_frame, text="Save to CSV", command=self.save_csv).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
+        ttk.Button(file_ops_frame, text="Check ARXML References", command=self.check_arxml).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
 
         # DID Operations Group
         did_ops_frame = ttk.LabelFrame(button_groups_frame, text="DID Operations", padding=scaled_pad_small)
@@ -503,11 +2293,19 @@ class DextGeneratorApp(ThemedTk):
         ttk.Button(did_ops_frame, text="Edit Selected DID", command=self.edit_did).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
         ttk.Button(did_ops_frame, text="Delete Selected DID", command=self.delete_did).pack(side=tk.LEFT, padx=scaled_pad_small, expand=True, fill=tk.X)
 
+        self.group_permissions_var = tk.BooleanVar(value=GROUP_ACCESS_PERMISSIONS)
+        ttk.Checkbutton(main_frame,
+                        text="Group access permissions by session and security",
+                        variable=self.group_permissions_var).pack(anchor='w', pady=(scaled_pad_small, 0))
+
         # The 'Generate.TButton' style is now configured in the __init__ method
         ttk.Button(main_frame,
                    text="Generate DEXT File",
                    command=self.generate_dext,
                    style='Generate.TButton').pack(fill=tk.X, pady=scaled_pad)
+        ttk.Button(main_frame,
+                   text="Generate Variants from Overlays",
+                   command=self.generate_variants).pack(fill=tk.X, pady=(0, scaled_pad))
 
         self.status_var = tk.StringVar(value="Ready")
         ttk.Label(self,
@@ -521,88 +2319,189 @@ class DextGeneratorApp(ThemedTk):
         for i in self.tree.get_children():
             self.tree.delete(i)
 
-        for name, data in self.dids_data.items():
-            signals = data.get("signals", [])
-            signal_count = len(signals)
+        self.tree_items = {}
+        for name in self._sorted_did_names():
+            values, _ = self._did_row(name, self.dids_data[name])
+            self.tree_items[name] = self.tree.insert('', tk.END, values=values)
 
-            total_size = 0
-            try:
-                for s in signals:
-                    signal_type = s.get('type', '').lower()
-                    if signal_type == 'string':
-                        # For strings, size is specified in the 'size' field
-                        total_size += int(s.get('size', 0))
-                    else:
-                        # For other types, use the predefined map
-                        total_size += self.TYPE_SIZE_MAP.get(signal_type, 0)
-            except (ValueError, TypeError):
-                total_size = "N/A"
-
-            # For backward compatibility, if read_enabled key doesn't exist, assume True
-            is_read_enabled = data.get("read_enabled")
-            if is_read_enabled is None:
-                is_read_enabled = True  # Default for old data format
-            read_enabled_str = "Yes" if is_read_enabled else "No"
-
-            is_write_enabled = data.get("write_enabled", False)
-            write_enabled_str = "Yes" if is_write_enabled else "No"
-
-            values = [
-                name,
-                data.get('id', 'N/A'),
-                read_enabled_str,
-                data.get('session', 'N/A') if is_read_enabled else "---",
-                data.get('security', 'N/A') if is_read_enabled else "---",
-                write_enabled_str,
-                data.get('write_session',
-                         'N/A') if is_write_enabled else "---",
-                data.get('write_security',
-                         'N/A') if is_write_enabled else "---",
-                signal_count,
-                total_size
-            ]
-            self.tree.insert('', tk.END, values=values)
+        # Drop cached rows of DIDs that were deleted or renamed
+        if len(self.row_cache) > len(self.dids_data):
+            self.row_cache = {name: row for name, row in self.row_cache.items()
+                              if name in self.dids_data}
 
         self.status_var.set(f"Loaded {len(self.dids_data)} DIDs.")
 
+    def _did_row(self, name, data):
+        """Returns the (values, sort_keys) of a DID's row, cached until its data object is replaced."""
+        cached = self.row_cache.get(name)
+        if cached is not None and cached[0] is data:
+            return cached[1], cached[2]
+
+        signals = data.get("signals", [])
+        signal_count = len(signals)
+
+        total_size = 0
+        try:
+            for s in signals:
+                signal_type = s.get('type', '').lower()
+                if signal_type == 'string':
+                    # For strings, size is specified in the 'size' field
+                    total_size += int(s.get('size', 0))
+                else:
+                    # For other types, use the predefined map
+                    total_size += self.TYPE_SIZE_MAP.get(signal_type, 0)
+        except (ValueError, TypeError):
+            total_size = "N/A"
+
+        # For backward compatibility, if read_enabled key doesn't exist, assume True
+        is_read_enabled = data.get("read_enabled")
+        if is_read_enabled is None:
+            is_read_enabled = True  # Default for old data format
+        read_enabled_str = "Yes" if is_read_enabled else "No"
+
+        is_write_enabled = data.get("write_enabled", False)
+        write_enabled_str = "Yes" if is_write_enabled else "No"
+
+        values = [
+            name,
+            data.get('id', 'N/A'),
+            read_enabled_str,
+            data.get('session', 'N/A') if is_read_enabled else "---",
+            data.get('security', 'N/A') if is_read_enabled else "---",
+            write_enabled_str,
+            data.get('write_session',
+                     'N/A') if is_write_enabled else "---",
+            data.get('write_security',
+                     'N/A') if is_write_enabled else "---",
+            signal_count,
+            total_size
+        ]
+
+        # One key per column. IDs sort numerically as hex and non-numeric
+        # values ("N/A", invalid IDs) sort after all numbers.
+        try:
+            id_key = (0, int(str(values[1]), 16))
+        except ValueError:
+            id_key = (1, str(values[1]).lower())
+        size_key = (0, total_size) if isinstance(total_size, int) else (1, 0)
+        sort_keys = tuple(
+            (name.lower(), name) if col == 'DID_Name'
+            else id_key if col == 'DID_ID'
+            else signal_count if col == 'Signal_Count'
+            else size_key if col == 'Total_Size_Bytes'
+            else str(value).lower()
+            for col, value in zip(self.columns, values))
+
+        self.row_cache[name] = (data, values, sort_keys)
+        return values, sort_keys
+
+    def _sorted_did_names(self):
+        if self.sort_column is None:
+            return list(self.dids_data)
+        col_idx = self.columns.index(self.sort_column)
+        row_cache = self.row_cache
+
+        def sort_key(name):
+            data = self.dids_data[name]
+            cached = row_cache.get(name)
+            if cached is not None and cached[0] is data:
+                return cached[2][col_idx]
+            return self._did_row(name, data)[1][col_idx]
+
+        return sorted(self.dids_data, key=sort_key, reverse=self.sort_reverse)
+
+    def sort_by_column(self, col):
+        """Sorts the DID list by a column, reordering the existing rows in place."""
+        if col == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = col, False
+
+        for c, title in self.column_titles.items():
+            arrow = (" \u25bc" if self.sort_reverse else " \u25b2") if c == col else ""
+            self.tree.heading(c, text=title + arrow)
+
+        # One Tcl call that reorders the existing items instead of a move() per row
+        self.tree.set_children('', *(self.tree_items[name] for name in self._sorted_did_names()))
+
     def load_csv(self):
         filepath = filedialog.askopenfilename(filetypes=[("CSV Files",
                                                           "*.csv")])
         if not filepath: return
 
-        temp_dids_data = defaultdict(lambda: {"signals": []})
         try:
-            with open(filepath, mode='r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    did_name = row.get('DID_Name')
-                    if not did_name: continue
-
-                    did_info = temp_dids_data[did_name]
-
-                    # Populate DID-level info only once from the first row for that DID
-                    if 'id' not in did_info:
-                        did_info['id'] = row.get('DID_ID')
-                        # For backward compatibility, default Read_Enabled to True if not in CSV
-                        did_info['read_enabled'] = row.get('Read_Enabled', 'True').lower() in ('true', '1', 'yes')
-                        did_info['session'] = row.get('Session', 'Default Session')
-                        did_info['security'] = row.get('SecurityLevel', 'No Security')
-                        did_info['write_enabled'] = row.get('Write_Enabled', 'False').lower() in ('true', '1', 'yes')
-                        did_info['write_session'] = row.get('Write_Session', 'Extended Session')
-                        did_info['write_security'] = row.get('Write_Security', 'Level 1')
-
-                    # Append signal info for every row that has a signal
-                    if row.get('SignalName'):
-                        did_info['signals'].append({
-                            "name": row['SignalName'],
-                            "type": row.get('DataType', 'uint8'),
-                            "size": row.get('Size', '1')
-                        })
-            self.dids_data = dict(temp_dids_data)
+            self.dids_data = read_dids_csv_parallel(filepath)
+            self.project_path = filepath
+            self.autosave.set_project(filepath)
             self._refresh_main_treeview()
         except Exception as e:
             messagebox.showerror("Error Loading CSV",
                                  f"An error occurred: {e}")
+            return
+        self._offer_autosave_recovery()
+
+    def import_odx(self):
+        """Replaces the current DIDs with the DID services found in an ODX or PDX file."""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("ODX/PDX Files", "*.odx *.odx-d *.pdx"),
+                       ("All Files", "*.*")])
+        if not filepath: return
+
+        try:
+            self.dids_data = read_dids_odx(filepath)
+            self.project_path = None  # Not saved as CSV yet
+            self.autosave.set_project(None)
+            self._refresh_main_treeview()
+        except Exception as e:
+            messagebox.showerror("Error Importing ODX",
+                                 f"An error occurred: {e}")
+
+    def merge_sources(self):
+        """Replaces the current DIDs with the merge of several CSV/ARXML sources.
+
+        Sources are ranked in the order they are selected, highest priority first.
+        """
+        sources = filedialog.askopenfilenames(
+            title="Select Sources (highest priority first)",
+            filetypes=[("DID Sources", "*.csv *.arxml"), ("All Files", "*.*")])
+        if not sources: return
+
+        try:
+            # Sorted CSVs are streamed; only unsorted ones are loaded and sorted in memory
+            merged, conflicts = merge_did_sources(list(sources), presorted=None)
+        except Exception as e:
+            messagebox.showerror("Error Merging Sources", f"An error occurred: {e}")
+            return
+
+        self.dids_data = merged
+        self.project_path = None
+        # The merged model only exists in memory, so it becomes the autosave base
+        self.autosave.set_project(None)
+        self.autosave.write_snapshot(self.dids_data)
+        self._refresh_main_treeview()
+        self.status_var.set(f"Merged {len(merged)} DIDs from {len(sources)} sources "
+                            f"with {len(conflicts)} conflicts.")
+        if conflicts and messagebox.askyesno(
+                "Merge Conflicts",
+                format_merge_conflicts(conflicts) + "\n\nSave the full conflict report?"):
+            self._save_merge_report(conflicts)
+
+    def _save_merge_report(self, conflicts):
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['DID_ID', 'Kind', 'Source', 'Value', 'Winner'])
+                for conflict in conflicts:
+                    for source, value in zip(conflict['sources'], conflict['values']):
+                        writer.writerow([conflict['did_id'], conflict['kind'], source,
+                                         value, source == conflict['winner']])
+        except Exception as e:
+            messagebox.showerror("Error Saving Report", f"An error occurred: {e}")
 
     def save_csv(self):
         """Saves the current list of DIDs and their signals to a CSV file."""
@@ -623,7 +2522,12 @@ class DextGeneratorApp(ThemedTk):
                 writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
 
-                for did_name, did_data in sorted(self.dids_data.items()):
+                # Rows in DID ID order let merge_did_sources stream the file
+                try:
+                    ordered = sorted(self.dids_data.items(), key=lambda item: _did_sort_key(*item))
+                except ValueError:
+                    ordered = sorted(self.dids_data.items())  # Not every DID ID is valid hex yet
+                for did_name, did_data in ordered:
                     read_enabled = did_data.get("read_enabled")
                     if read_enabled is None:
                         read_enabled = True  # Backward compatibility
@@ -650,10 +2554,34 @@ class DextGeneratorApp(ThemedTk):
                                 'DataType': signal.get('type', ''),
                                 'Size': signal.get('size', '')})
                             writer.writerow(row)
+            self.project_path = filepath
+            self.autosave.set_project(filepath)
             self.status_var.set(f"Successfully saved DIDs to {filepath}")
         except Exception as e:
             messagebox.showerror("Error Saving CSV", f"An error occurred: {e}")
 
+    def check_arxml(self):
+        """Checks an ARXML file for dangling references and duplicate SHORT-NAME paths."""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("ARXML Files", "*.arxml"), ("All Files", "*.*")])
+        if not filepath: return
+
+        try:
+            report = check_arxml_references(filepath)
+        except Exception as e:
+            messagebox.showerror("Error Checking ARXML", f"An error occurred: {e}")
+            return
+
+        summary = (f"{report['paths']} paths, {report['references']} references checked.\n\n"
+                   + format_reference_report(report))
+        if report["dangling"] or report["duplicates"]:
+            messagebox.showwarning("Reference Problems", summary)
+        else:
+            messagebox.showinfo("References OK", summary)
+        self.status_var.set(
+            f"Checked '{filepath}': {len(report['dangling'])} dangling, "
+            f"{len(report['duplicates'])} duplicate paths.")
+
     def add_did(self):
         DIDEditorWindow(self, self.scale_factor)
 
@@ -677,6 +2605,7 @@ class DextGeneratorApp(ThemedTk):
                 "Confirm Delete",
                 f"Are you sure you want to delete '{did_name}'?"):
             del self.dids_data[did_name]
+            self.autosave.record_delete(self.dids_data, did_name)
             self._refresh_main_treeview()
 
     def update_did(self, original_name, new_name, data):
@@ -684,6 +2613,7 @@ class DextGeneratorApp(ThemedTk):
         if original_name and original_name in self.dids_data and original_name != new_name:
             del self.dids_data[original_name]
         self.dids_data[new_name] = data
+        self.autosave.record_update(self.dids_data, original_name, new_name, data)
         self._refresh_main_treeview()
 
     def generate_dext(self):
@@ -692,204 +2622,107 @@ class DextGeneratorApp(ThemedTk):
             return
 
         # --- Validation for unique DID IDs ---
-        id_to_names = defaultdict(list)
-        for did_name, data in self.dids_data.items():
-            did_id = data.get('id', '').strip()
-            if did_id:
-                # Normalize to handle potential case differences e.g., 'F100' vs 'f100'
-                id_to_names[did_id.lower()].append(did_name)
-
-        duplicates = {
-            id_val: names
-            for id_val, names in id_to_names.items() if len(names) > 1
-        }
-
+        duplicates = find_duplicate_did_ids(self.dids_data)
         if duplicates:
-            error_message = "Found duplicate DID IDs. Please correct them before generating:\n\n"
-            for did_id_lower, did_names in duplicates.items():
-                # Get the ID with its original casing from the first DID that uses it
-                original_id_casing = self.dids_data[did_names[0]].get('id', did_id_lower)
-                error_message += f"ID '{original_id_casing}' is used by DIDs: {', '.join(did_names)}\n"
-
-            messagebox.showerror("Duplicate DID IDs", error_message)
+            messagebox.showerror("Duplicate DID IDs",
+                                 "Found duplicate DID IDs. Please correct them before generating:\n\n"
+                                 + format_duplicate_did_ids(duplicates))
             self.status_var.set("Generation failed: Duplicate DID IDs found.")
             return
         # --- End Validation ---
 
         self.status_var.set(
             f"Generating DEXT for {len(self.dids_data)} DIDs...")
-        self._run_generation_logic(self.dids_data)
-
-    # --- XML Generation Logic (largely the same, just adapted for new data structure) ---
-    def _run_generation_logic(self, dids_data):
-        ET.register_namespace('', AUTOSAR_NAMESPACE)
-        root = ET.Element(
-            "AUTOSAR", {f"{{{XSI_NAMESPACE}}}schemaLocation": SCHEMA_LOCATION})
-        ar_packages = ET.SubElement(root, "AR-PACKAGES")
-
-        dext_elements = self._create_ar_package(ar_packages,
-                                                "MyECU_DiagnosticExtract")
-        data_elements_package = self._create_ar_package(
-            ar_packages, "MyECU_DataElements")
-        data_types_package = self._create_ar_package(ar_packages,
-                                                     "MyECU_DataTypes")
-        access_perms_package = self._create_ar_package(
-            ar_packages, "MyECU_AccessPermissions")
+        self._run_generation_logic(self.dids_data,
+                                   self.group_permissions_var.get())
 
-        # Create common access control objects
-        ET.SubElement(access_perms_package, "DIAGNOSTIC-SESSION-CONTROL").set(
-            "SHORT-NAME", "Default_Session")
-        ET.SubElement(access_perms_package, "DIAGNOSTIC-SESSION-CONTROL").set(
-            "SHORT-NAME", "Extended_Session")
-        ET.SubElement(access_perms_package, "DIAGNOSTIC-SESSION-CONTROL").set(
-            "SHORT-NAME", "Programming_Session")
-        ET.SubElement(access_perms_package,
-                      "DIAGNOSTIC-SECURITY-LEVEL").set("SHORT-NAME",
-                                                       "No_Security")
-        ET.SubElement(access_perms_package,
-                      "DIAGNOSTIC-SECURITY-LEVEL").set("SHORT-NAME", "Level_1")
-        ET.SubElement(access_perms_package,
-                      "DIAGNOSTIC-SECURITY-LEVEL").set("SHORT-NAME", "Level_2")
-
-        for did_name, data in dids_data.items():
-            did_dec = str(int(data['id'], 16))
-            did_element = ET.SubElement(dext_elements,
-                                        "DIAGNOSTIC-DATA-IDENTIFIER")
-            ET.SubElement(did_element, "SHORT-NAME").text = did_name
-            ET.SubElement(did_element, "ID").text = did_dec
-            data_element_refs = ET.SubElement(did_element, "DATA-ELEMENT-REFS")
-
-            for signal in data['signals']:
-                signal_name = signal['name']
-                # Make short-names unique by prepending DID name to avoid conflicts
-                unique_element_name = f"{did_name}_{signal_name}"
-
-                data_element = ET.SubElement(
-                    data_elements_package, "DATA-ELEMENT-PROTOTYPE")
-                ET.SubElement(data_element,
-                              "SHORT-NAME").text = unique_element_name
-                type_name = self._create_implementation_data_type(
-                    data_types_package, signal, unique_element_name)
-                ET.SubElement(data_element,
-                              "TYPE-TREF",
-                              DEST="IMPLEMENTATION-DATA-TYPE"
-                              ).text = f"/MyECU_DataTypes/{type_name}"
-                ET.SubElement(data_element_refs,
-                              "DATA-ELEMENT-REF",
-                              DEST="DATA-ELEMENT-PROTOTYPE"
-                              ).text = f"/MyECU_DataElements/{unique_element_name}"
-
-            # --- Create Read Access Permission ---
-            if data.get("read_enabled", True):  # Default to True for backward compatibility
-                session = data['session'].replace(" ", "_")
-                security = data['security'].replace(" ", "_")
-
-                read_access_perm = ET.SubElement(access_perms_package,
-                                                 "DIAGNOSTIC-ACCESS-PERMISSION")
-                ET.SubElement(read_access_perm,
-                              "SHORT-NAME").text = f"{did_name}_Read_Access"
-                ET.SubElement(
-                    read_access_perm, "SERVICE-REF", DEST="DIAGNOSTIC-SERVICE-CLASS"
-                ).text = "/AUTOSAR_Dcm/DiagnosticServices/ReadDataByIdentifier"
-                ET.SubElement(ET.SubElement(read_access_perm,
-                                            "DIAG-DATA-IDENTIFIER-REFS"),
-                              "DIAG-DATA-IDENTIFIER-REF",
-                              DEST="DIAGNOSTIC-DATA-IDENTIFIER"
-                              ).text = f"/MyECU_DiagnosticExtract/{did_name}"
-                ET.SubElement(ET.SubElement(read_access_perm, "SESSIONS"),
-                              "SESSION-REF",
-                              DEST="DIAGNOSTIC-SESSION-CONTROL"
-                              ).text = f"/MyECU_AccessPermissions/{session}"
-                ET.SubElement(ET.SubElement(read_access_perm, "SECURITY-LEVELS"),
-                              "SECURITY-LEVEL-REF",
-                              DEST="DIAGNOSTIC-SECURITY-LEVEL"
-                              ).text = f"/MyECU_AccessPermissions/{security}"
-
-            # --- Create Write Access Permission (if enabled) ---
-            if data.get("write_enabled"):
-                write_session = data.get("write_session", "Default Session").replace(" ", "_")
-                write_security = data.get("write_security", "No Security").replace(" ", "_")
-
-                write_access_perm = ET.SubElement(
-                    access_perms_package, "DIAGNOSTIC-ACCESS-PERMISSION")
-                ET.SubElement(
-                    write_access_perm, "SHORT-NAME").text = f"{did_name}_Write_Access"
-                ET.SubElement(write_access_perm, "SERVICE-REF",
-                              DEST="DIAGNOSTIC-SERVICE-CLASS").text = "/AUTOSAR_Dcm/DiagnosticServices/WriteDataByIdentifier"
-                ET.SubElement(ET.SubElement(write_access_perm, "DIAG-DATA-IDENTIFIER-REFS"),
-                              "DIAG-DATA-IDENTIFIER-REF",
-                              DEST="DIAGNOSTIC-DATA-IDENTIFIER").text = f"/MyECU_DiagnosticExtract/{did_name}"
-                ET.SubElement(ET.SubElement(write_access_perm, "SESSIONS"),
-                              "SESSION-REF",
-                              DEST="DIAGNOSTIC-SESSION-CONTROL").text = f"/MyECU_AccessPermissions/{write_session}"
-                ET.SubElement(ET.SubElement(write_access_perm, "SECURITY-LEVELS"),
-                              "SECURITY-LEVEL-REF",
-                              DEST="DIAGNOSTIC-SECURITY-LEVEL").text = f"/MyECU_AccessPermissions/{write_security}"
+    def generate_variants(self):
+        """Generates one DEXT file per overlay CSV, using the loaded DIDs as the base."""
+        if not self.dids_data:
+            messagebox.showerror("Error", "Load the base DID set before generating variants.")
+            return
+        overlay_paths = filedialog.askopenfilenames(
+            title="Select Variant Overlays",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
+        if not overlay_paths: return
+        output_dir = filedialog.askdirectory(title="Select Output Directory")
+        if not output_dir: return
+
+        try:
+            overlays = read_overlays(overlay_paths)
+            for variant_name, overlay in overlays.items():
+                duplicates = find_duplicate_did_ids(apply_overlay(self.dids_data, overlay))
+                if duplicates:
+                    messagebox.showerror("Duplicate DID IDs",
+                                         f"Variant '{variant_name}' has duplicate DID IDs:\n\n"
+                                         + format_duplicate_did_ids(duplicates))
+                    self.status_var.set("Generation failed: Duplicate DID IDs found.")
+                    return
+
+            for variant_name, xml in self.generator.generate_variants(
+                    self.dids_data, overlays, self.group_permissions_var.get()):
+                with open(os.path.join(output_dir, f"{variant_name}.arxml"), 'wb') as f:
+                    f.write(xml)
+            self.status_var.set(f"Generated {len(overlays)} variants in '{output_dir}'")
+        except Exception as e:
+            messagebox.showerror("Generation Error", f"An error occurred: {e}")
 
+    # --- XML Generation Logic ---
+    def _run_generation_logic(self, dids_data, group_permissions=False):
         try:
-            xml_str = ET.tostring(root, 'utf-8')
-            pretty_xml_str = minidom.parseString(xml_str).toprettyxml(
-                indent="    ", encoding="utf-8")
+            pretty_xml_str = self.generator.generate(dids_data, group_permissions)
             with open(ARXML_OUTPUT_FILE, 'wb') as f:
                 f.write(pretty_xml_str)
-            messagebox.showinfo(
-                "Success",
-                f"DEXT file '{ARXML_OUTPUT_FILE}' generated successfully.")
+            report = check_arxml_references(io.BytesIO(pretty_xml_str))
+            if report["dangling"] or report["duplicates"]:
+                messagebox.showwarning(
+                    "Reference Problems",
+                    f"DEXT file '{ARXML_OUTPUT_FILE}' was generated, but has reference problems:\n\n"
+                    + format_reference_report(report))
+            else:
+                messagebox.showinfo(
+                    "Success",
+                    f"DEXT file '{ARXML_OUTPUT_FILE}' generated successfully.")
             self.status_var.set(
                 f"Successfully generated '{ARXML_OUTPUT_FILE}'")
         except Exception as e:
             messagebox.showerror("Generation Error", f"An error occurred: {e}")
 
-    def _create_ar_package(self, parent, short_name):
-        ar_package = ET.SubElement(parent, "AR-PACKAGE")
-        ET.SubElement(ar_package, "SHORT-NAME").text = short_name
-        return ET.SubElement(ar_package, "ELEMENTS")
-
-    def _create_implementation_data_type(self, parent, signal_info,
-                                         unique_prefix):
-        data_type = signal_info['type']
-        size = signal_info['size']
-        short_name = f"{unique_prefix}_Type"
-
-        if data_type.lower() == 'string':
-            impl_data_type = ET.SubElement(parent, "IMPLEMENTATION-DATA-TYPE")
-            ET.SubElement(impl_data_type, "SHORT-NAME").text = short_name
-            ET.SubElement(impl_data_type, "CATEGORY").text = "ARRAY"
-            sub_elements = ET.SubElement(impl_data_type, "SUB-ELEMENTS")
-            element = ET.SubElement(sub_elements,
-                                    "IMPLEMENTATION-DATA-TYPE-ELEMENT")
-            ET.SubElement(
-                element, "SHORT-NAME").text = f"{unique_prefix}_Byte"
-            ET.SubElement(element, "CATEGORY").text = "TYPE_REFERENCE"
-            ET.SubElement(element, "ARRAY-SIZE").text = str(size)
-            props = ET.SubElement(element, "SW-DATA-DEF-PROPS")
-            variants = ET.SubElement(props, "SW-DATA-DEF-PROPS-VARIANTS")
-            cond = ET.SubElement(variants, "SW-DATA-DEF-PROPS-CONDITIONAL")
-            ET.SubElement(
-                cond,
-                "IMPLEMENTATION-DATA-TYPE-REF",
-                DEST="IMPLEMENTATION-DATA-TYPE"
-            ).text = "/AUTOSAR_Platform/ImplementationDataTypes/uint8"
-        else:
-            impl_data_type = ET.SubElement(parent, "IMPLEMENTATION-DATA-TYPE")
-            ET.SubElement(impl_data_type, "SHORT-NAME").text = short_name
-            ET.SubElement(impl_data_type, "CATEGORY").text = "VALUE"
-            props = ET.SubElement(impl_data_type, "SW-DATA-DEF-PROPS")
-            variants = ET.SubElement(props, "SW-DATA-DEF-PROPS-VARIANTS")
-            cond = ET.SubElement(variants, "SW-DATA-DEF-PROPS-CONDITIONAL")
-            ET.SubElement(
-                cond, "BASE-TYPE-REF", DEST="IMPLEMENTATION-DATA-TYPE"
-            ).text = f"/AUTOSAR_Platform/ImplementationDataTypes/{data_type}"
-
-        return short_name
-
 
 if __name__ == "__main__":
-    try:
-        # Make the application DPI-aware on Windows, resulting in a sharper UI.
-        from ctypes import windll
-        windll.shcore.SetProcessDpiAwareness(1)
-    except (ImportError, AttributeError):
-        pass  # This will fail on non-Windows systems, which is fine.
-    app = DextGeneratorApp()
-    app.mainloop()
+    parser = argparse.ArgumentParser(description="DEXT Generator Tool")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the resident generation server instead of the GUI")
+    parser.add_argument("--host", help="listen on this loopback address instead of the Unix socket")
+    parser.add_argument("--port", type=int, default=DEXT_SERVER_PORT)
+    parser.add_argument("--workspace", default=os.getcwd(),
+                        help="directory that request file paths must lie in")
+    args = parser.parse_args()
+
+    if args.serve:
+        try:
+            server = DextServer(host=args.host, port=args.port, workspace=args.workspace)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if server.socket_path is not None:
+            print(f"DEXT generation server listening on {server.socket_path}")
+        else:
+            host, port = server.server_address[:2]
+            print(f"DEXT generation server listening on http://{host}:{port} "
+                  f"(token in {DEXT_SERVER_TOKEN_FILE})")
+        print(f"Workspace: {server.workspace}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    else:
+        try:
+            # Make the application DPI-aware on Windows, resulting in a sharper UI.
+            from ctypes import windll
+            windll.shcore.SetProcessDpiAwareness(1)
+        except (ImportError, AttributeError):
+            pass  # This will fail on non-Windows systems, which is fine.
+        app = DextGeneratorApp()
+        app.mainloop()
@@ -0,0 +1,222 @@
+import csv
+import http.client
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import DEXT
+
+CSV_HEADERS = ['DID_Name', 'DID_ID', 'Read_Enabled', 'Session', 'SecurityLevel',
+               'Write_Enabled', 'Write_Session', 'Write_Security', 'SignalName',
+               'DataType', 'Size']
+
+
+def make_dids(count):
+    return {f"DID_{i}": {"id": format(0xF100 + i, 'X'),
+                         "read_enabled": True,
+                         "session": "Default Session",
+                         "security": "No Security",
+                         "write_enabled": i % 3 == 0,
+                         "write_session": "Extended Session",
+                         "write_security": "Level 1",
+                         "signals": [{"name": "Value", "type": "uint16", "size": "2"},
+                                     {"name": "Text", "type": "string", "size": "8"}]}
+            for i in range(count)}
+
+
+def write_csv(path, rows, extra_headers=()):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS + list(extra_headers))
+        writer.writerows(rows)
+
+
+# --- DextServer / DextClient ---
+@pytest.fixture
+def unix_server(tmp_path):
+    if not hasattr(DEXT.socket, "AF_UNIX"):
+        pytest.skip("Unix sockets are not available")
+    socket_path = str(tmp_path / "dext.sock")
+    server = DEXT.DextServer(socket_path=socket_path, workspace=str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, DEXT.DextClient(socket_path=socket_path)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def tcp_server(tmp_path, monkeypatch):
+    monkeypatch.setattr(DEXT, "DEXT_RUNTIME_DIR", str(tmp_path / "runtime"))
+    monkeypatch.setattr(DEXT, "DEXT_SERVER_TOKEN_FILE", str(tmp_path / "runtime" / "server.token"))
+    server = DEXT.DextServer(host="127.0.0.1", port=0, workspace=str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_generate_matches_generator(unix_server, tmp_path):
+    server, client = unix_server
+    dids = make_dids(50)
+    assert client.load_project("ecu", dids=dids) == {"project": "ecu", "dids": 50}
+
+    outputs = [str(tmp_path / f"out_{i}.arxml") for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda output: client.generate("ecu", output), outputs))
+
+    expected = DEXT.DextGenerator().generate(dids)
+    assert [result["output"] for result in results] == outputs
+    for output in outputs:
+        with open(output, 'rb') as f:
+            assert f.read() == expected
+
+
+def test_paths_outside_workspace_are_rejected(unix_server, tmp_path):
+    _, client = unix_server
+    client.load_project("ecu", dids=make_dids(1))
+    with pytest.raises(RuntimeError, match="outside the server workspace"):
+        client.generate("ecu", str(tmp_path.parent / "escaped.arxml"))
+    with pytest.raises(RuntimeError, match="outside the server workspace"):
+        client.load_project("other", csv_path="/etc/passwd")
+    with pytest.raises(RuntimeError, match=r"\.arxml"):
+        client.generate("ecu", str(tmp_path / "out.txt"))
+    assert not (tmp_path.parent / "escaped.arxml").exists()
+
+
+def test_stats_are_keyed_by_route(unix_server):
+    _, client = unix_server
+    client.load_project("ecu", dids=make_dids(3))
+    for path in ("/junk0", "/junk1"):
+        with pytest.raises(RuntimeError, match="Unknown endpoint"):
+            client._request("GET", path)
+
+    stats = client.stats()
+    assert stats["projects"] == {"ecu": 3}
+    assert stats["errors"] == 2
+    assert set(stats["latency"]) == {"load_project", "unmatched"}
+    assert stats["latency"]["unmatched"]["count"] == 2
+
+
+def test_tcp_requires_token_and_json(tcp_server, tmp_path):
+    port = tcp_server.server_address[1]
+    body = json.dumps({"project": "ecu", "dids": make_dids(1)})
+
+    def post(headers):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        try:
+            connection.request("POST", "/project", body, headers)
+            return connection.getresponse().status
+        finally:
+            connection.close()
+
+    assert post({"Content-Type": "application/json"}) == 403
+    assert post({"Content-Type": "text/plain", DEXT.DEXT_TOKEN_HEADER: tcp_server.token}) == 415
+
+    client = DEXT.DextClient(host="127.0.0.1", port=port)
+    assert client.load_project("ecu", dids=make_dids(1))["dids"] == 1
+
+
+def test_non_loopback_host_is_refused(tmp_path):
+    with pytest.raises(ValueError, match="non-loopback"):
+        DEXT.DextServer(host="0.0.0.0", port=0, workspace=str(tmp_path))
+
+
+# --- Parallel CSV loading ---
+def test_parallel_csv_matches_sequential(tmp_path, monkeypatch):
+    monkeypatch.setattr(DEXT, "PARALLEL_CSV_MIN_BYTES", 0)
+    rows = []
+    for i in range(2000):
+        for signal in range(3):
+            rows.append([f"did{i}", format(i, 'X'), 'True', 'Default Session', 'No Security',
+                         'False', '', '', f"sig{signal}", 'uint8', '1'])
+    plain = tmp_path / "plain.csv"
+    write_csv(plain, rows)
+    assert DEXT.read_dids_csv_parallel(str(plain), workers=2) == DEXT.read_dids_csv(str(plain))
+
+    # Quoted line breaks make the newline-aligned shards split records
+    for row in rows[::2]:
+        row[8] = f"multi\nline {row[8]}"
+    quoted = tmp_path / "quoted.csv"
+    write_csv(quoted, rows)
+    assert DEXT.read_dids_csv_parallel(str(quoted), workers=2) == DEXT.read_dids_csv(str(quoted))
+
+
+# --- Variant overlays ---
+def test_generate_variants_matches_full_generation(tmp_path):
+    base = make_dids(20)
+    overlay_path = tmp_path / "variant_a.csv"
+    write_csv(overlay_path, [
+        ['DID_3', '', '', '', '', '', '', '', '', '', '', 'remove'],
+        ['DID_4', 'F104', 'True', 'Extended Session', 'Level 2', 'True',
+         'Programming Session', 'Level 2', '', '', '', 'permissions'],
+        ['DID_New', 'F200', 'True', 'Default Session', 'No Security', 'False', '', '',
+         'Flag', 'boolean', '1', 'set'],
+    ], extra_headers=[DEXT.OVERLAY_ACTION_COLUMN])
+    overlays = DEXT.read_overlays([str(overlay_path)])
+
+    generator = DEXT.DextGenerator()
+    variants = dict(generator.generate_variants(base, overlays, group_permissions=True))
+    expected = DEXT.DextGenerator().generate(
+        DEXT.apply_overlay(base, overlays["variant_a"]), group_permissions=True)
+    assert variants == {"variant_a": expected}
+
+
+def test_overlays_with_the_same_name_are_rejected(tmp_path):
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        write_csv(tmp_path / directory / "variant.csv", [])
+    with pytest.raises(ValueError, match="variant"):
+        DEXT.read_overlays([str(tmp_path / "a" / "variant.csv"),
+                            str(tmp_path / "b" / "variant.csv")])
+
+
+# --- Autosave journal ---
+def _end_session(journal):
+    """Leaves a journal behind as a crashed session would."""
+    journal.close()
+    journal._lock_file.close()
+    journal._lock_file = None
+
+
+def test_recovery_after_torn_record_keeps_later_edits(tmp_path):
+    project = str(tmp_path / "model.csv")
+    dids = {}
+    first = DEXT.AutosaveJournal(project)
+    for name in "abc":
+        dids[name] = {"id": name}
+        first.record_update(dids, None, name, dids[name])
+    _end_session(first)
+    with open(first.journal_path, 'a', encoding='utf-8') as f:
+        f.write('["u",null,"x",{"id"')  # Crash mid-append
+
+    second = DEXT.AutosaveJournal(project)
+    dids = second.recover(DEXT.AutosaveJournal.find(project)[0])
+    assert sorted(dids) == ["a", "b", "c"]
+    for name in "ef":
+        dids[name] = {"id": name}
+        second.record_update(dids, None, name, dids[name])
+    _end_session(second)
+
+    third = DEXT.AutosaveJournal(project)
+    snapshots = DEXT.AutosaveJournal.find(project)
+    assert len(snapshots) == 1
+    assert sorted(third.recover(snapshots[0])) == ["a", "b", "c", "e", "f"]
+    third.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_running_session_autosave_is_not_offered(tmp_path):
+    project = str(tmp_path / "model.csv")
+    running = DEXT.AutosaveJournal(project)
+    running.record_update({"a": {}}, None, "a", {})
+
+    assert DEXT.AutosaveJournal.find(project) == []
+    with pytest.raises(OSError):
+        DEXT.AutosaveJournal.discard(running.snapshot_path)
+    assert running.has_data()
+    running.clear()